@@ -0,0 +1,81 @@
+"""
+End-to-end latency harness.
+
+Runs the engine simulator and the controller side by side on this host with
+latency tracing enabled, then reports per-hop and end-to-end latency
+percentiles from the controller's latency report.
+
+Requires a device agent listening locally, e.g.::
+
+    docker compose -f simulators/docker-compose.yml up device_agent
+
+Then run (from the repository root, with the project installed)::
+
+    python simulators/latency_harness.py --duration 120
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).parent
+
+SIM_APP_KEY = "sim_app_key"
+CONTROLLER_APP_KEY = "test_app_key"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure simulator -> controller latency")
+    parser.add_argument("--duration", type=int, default=90, help="Seconds to run for (default: 90)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="dse_latency_"))
+    report_path = workdir / "latency.json"
+
+    config = json.loads((HERE / "app_config.json").read_text())
+    config["latency_tracing"] = True
+    config["latency_report_path"] = str(report_path)
+    config["state_checkpoint_path"] = str(workdir / "checkpoint.json")
+    config_path = workdir / "app_config.json"
+    config_path.write_text(json.dumps(config, indent=4))
+
+    env = dict(os.environ)
+    simulator = subprocess.Popen(
+        [sys.executable, str(HERE / "sample" / "main.py")],
+        env={**env, "APP_KEY": SIM_APP_KEY, "HEALTHCHECK_PORT": "49210"},
+    )
+    controller = subprocess.Popen(
+        [sys.executable, "-c", "from dse_engine_controller import main; main()"],
+        env={**env, "APP_KEY": CONTROLLER_APP_KEY, "CONFIG_FP": str(config_path), "HEALTHCHECK_PORT": "49211"},
+    )
+
+    try:
+        print(f"Running simulator and controller for {args.duration}s...")
+        time.sleep(args.duration)
+    finally:
+        for proc in (controller, simulator):
+            proc.terminate()
+        for proc in (controller, simulator):
+            proc.wait(timeout=10)
+
+    if not report_path.exists():
+        print("No latency report written; check the controller output above.")
+        return 1
+
+    report = json.loads(report_path.read_text())
+    print(f"\n{'hop':<24}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'count':>8}")
+    for hop, stats in report.items():
+        print(f"{hop:<24}{stats['p50']:>10.2f}{stats['p90']:>10.2f}{stats['p99']:>10.2f}{stats['max']:>10.2f}{stats['count']:>8}")
+
+    end_to_end = report.get("end_to_end")
+    if end_to_end:
+        print(f"\nEnd-to-end: p50 {end_to_end['p50']:.2f} ms, p99 {end_to_end['p99']:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import math
 import random
 import time
 
@@ -17,6 +18,10 @@ class EngineSimulator(Application):
         self.engine_running = False
         self.engine_hours = 1234.5
         self.start_time = time.time()
+        self.sample_seq = 0
+
+        # High-rate samples published alongside each 1 Hz update
+        self.sample_rate_hz = 50
 
     async def setup(self):
         pass
@@ -39,6 +44,7 @@ class EngineSimulator(Application):
             battery_voltage = 14.2 + random.uniform(-0.2, 0.2)
             fuel_level = max(0, 75 - (time.time() - self.start_time) / 3600 * 5)  # Slow consumption
             self.engine_hours += 1 / 3600  # Add 1 second of runtime
+            rpm_samples, oil_pressure_samples = self._high_rate_samples(1500, 40)
         else:
             # Stopped engine parameters
             rpm = 0
@@ -46,15 +52,50 @@ class EngineSimulator(Application):
             coolant_temp = 25 + random.uniform(-2, 2)
             battery_voltage = 12.6 + random.uniform(-0.1, 0.1)
             fuel_level = 75
+            rpm_samples = oil_pressure_samples = None
+
+        # Publish simulated sensor values as one tag update, stamped so the controller can detect stale data
+        self.sample_seq += 1
+        await self.set_tags({
+            "sample_seq": self.sample_seq,
+            "sample_ts": time.time(),
+            # Tracing stamps: monotonic time is comparable with the controller's when both run on one host
+            "sample_mono": time.monotonic(),
+            "trace_id": f"{self.app_key}-{self.sample_seq}",
+            "rpm": round(rpm, 1),
+            "oil_pressure": round(oil_pressure, 1),
+            "coolant_temp": round(coolant_temp, 1),
+            "battery_voltage": round(battery_voltage, 2),
+            "fuel_level": round(fuel_level, 0),
+            "engine_hours": round(self.engine_hours, 1),
+            "engine_running": self.engine_running,
+            "rpm_samples": rpm_samples,
+            "oil_pressure_samples": oil_pressure_samples,
+            "sample_rate_hz": self.sample_rate_hz,
+        })
+
+    def _high_rate_samples(self, rpm: float, oil_pressure: float) -> tuple[list[float], list[float]]:
+        """
+        Generate one second of high-rate RPM and oil pressure samples.
 
-        # Publish simulated sensor values as tags
-        await self.set_tag("rpm", round(rpm, 1))
-        await self.set_tag("oil_pressure", round(oil_pressure, 1))
-        await self.set_tag("coolant_temp", round(coolant_temp, 1))
-        await self.set_tag("battery_voltage", round(battery_voltage, 2))
-        await self.set_tag("fuel_level", round(fuel_level, 0))
-        await self.set_tag("engine_hours", round(self.engine_hours, 1))
-        await self.set_tag("engine_running", self.engine_running)
+        Set the `inject_fault` tag to "hunting" or "misfire" to add a governor
+        hunting oscillation or a repeating misfire dip.
+        """
+        inject = self.get_tag("inject_fault")
+        now = time.time()
+        rpm_samples = []
+        oil_pressure_samples = []
+        for i in range(self.sample_rate_hz):
+            t = now + i / self.sample_rate_hz
+            value = rpm + random.uniform(-3, 3)
+            if inject == "hunting":
+                value += 40 * math.sin(2 * math.pi * 1.0 * t)
+            elif inject == "misfire":
+                # One cylinder dropping out once per engine cycle (two revolutions)
+                value -= 30 * max(0.0, math.cos(2 * math.pi * rpm / 120 * t)) ** 8
+            rpm_samples.append(round(value, 1))
+            oil_pressure_samples.append(round(oil_pressure + random.uniform(-0.5, 0.5), 2))
+        return rpm_samples, oil_pressure_samples
 
 
 def main():
@@ -1,11 +1,17 @@
-from pydoover.docker import run_app
+import time
 
-from .application import DseEngineControllerApplication
-from .app_config import DseEngineControllerConfig
+# Earliest point we control in a (re)started container; used to measure time to first main loop.
+STARTED_AT = time.monotonic()
 
 
 def main():
     """
     Run the DSE Engine Controller application.
     """
+    # Imported here so lightweight submodules can be imported without pulling in pydoover.
+    from pydoover.docker import run_app
+
+    from .application import DseEngineControllerApplication
+    from .app_config import DseEngineControllerConfig
+
     run_app(DseEngineControllerApplication(config=DseEngineControllerConfig()))
@@ -0,0 +1,195 @@
+"""
+Spectral and variance analysis of high-rate engine samples.
+
+`analyse_window` is a pure function so it can run in a worker process;
+`EngineAnalyser` buffers samples and schedules it off the event loop.
+"""
+import cmath
+import logging
+import math
+from collections import deque
+from concurrent.futures import Executor, Future
+
+log = logging.getLogger(__name__)
+
+# Governor hunting shows up as a slow oscillation in speed
+HUNTING_BAND_HZ = (0.2, 3.0)
+
+
+def analyse_window(rpm: list[float], oil_pressure: list[float], sample_rate_hz: float) -> dict:
+    """
+    Compute RPM and oil-pressure stability indicators for one window.
+
+    Returns:
+        hunting_amplitude_rpm: peak oscillation amplitude in the hunting band
+        hunting_frequency_hz: frequency of that peak
+        misfire_ratio: share of RPM fluctuation energy at the engine's cycle
+            frequency (RPM / 120 for a four-stroke), where a repeating misfire
+            concentrates; None if the sample rate is too low to see it
+        roughness_rpm: standard deviation of sample-to-sample RPM change
+        oil_pressure_std_psi: standard deviation of oil pressure
+    """
+    n = 1 << (len(rpm).bit_length() - 1)  # largest power of two that fits
+    rpm = rpm[-n:]
+
+    mean_rpm = sum(rpm) / n
+    # Hann window to limit leakage; amplitude is corrected by the window's coherent gain
+    window = [0.5 - 0.5 * math.cos(2 * math.pi * i / n) for i in range(n)]
+    spectrum = _fft([(x - mean_rpm) * w for x, w in zip(rpm, window)])
+    gain = sum(window) / 2
+    amplitudes = [abs(spectrum[k]) / gain for k in range(n // 2 + 1)]
+    bin_hz = sample_rate_hz / n
+
+    low, high = (max(1, math.floor(f / bin_hz)) for f in HUNTING_BAND_HZ)
+    hunting_bin = max(range(low, min(high, n // 2) + 1), key=amplitudes.__getitem__, default=None)
+
+    misfire_ratio = None
+    cycle_hz = mean_rpm / 120
+    if cycle_hz > 0 and cycle_hz < sample_rate_hz / 2:
+        cycle_bin = round(cycle_hz / bin_hz)
+        energy = [a * a for a in amplitudes[1:]]
+        total = sum(energy)
+        if total > 0:
+            near = energy[max(0, cycle_bin - 2):cycle_bin + 1]  # cycle bin +/- 1, offset by the DC bin
+            misfire_ratio = sum(near) / total
+
+    diffs = [b - a for a, b in zip(rpm, rpm[1:])]
+    return {
+        "hunting_amplitude_rpm": amplitudes[hunting_bin] if hunting_bin is not None else 0.0,
+        "hunting_frequency_hz": hunting_bin * bin_hz if hunting_bin is not None else None,
+        "misfire_ratio": misfire_ratio,
+        "roughness_rpm": _std(diffs),
+        "oil_pressure_std_psi": _std(oil_pressure) if oil_pressure else None,
+    }
+
+
+def _fft(values: list[complex]) -> list[complex]:
+    """Iterative radix-2 FFT; `values` length must be a power of two."""
+    n = len(values)
+    result = list(values)
+
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            result[i], result[j] = result[j], result[i]
+
+    size = 2
+    while size <= n:
+        step = cmath.exp(-2j * math.pi / size)
+        for start in range(0, n, size):
+            w = 1
+            for k in range(start, start + size // 2):
+                t = w * result[k + size // 2]
+                result[k + size // 2] = result[k] - t
+                result[k] = result[k] + t
+                w *= step
+        size <<= 1
+    return result
+
+
+def _std(values: list[float]) -> float:
+    if len(values) < 2:
+        return 0.0
+    mean = sum(values) / len(values)
+    return math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1))
+
+
+def score_health(result: dict, thresholds: dict[str, float]) -> tuple[dict[str, int], list[str]]:
+    """
+    Turn an analysis result into 0-100 health scores and a list of alarms.
+
+    `thresholds` maps indicator name (a key of `result`) to the value at
+    which it alarms. A score of 100 means no measurable deviation; the score
+    reaches 0, and the alarm is raised, at the threshold.
+    """
+    scores = {}
+    alarms = []
+    for name, threshold in thresholds.items():
+        value = result.get(name)
+        if value is None or not threshold or threshold <= 0:
+            continue
+        scores[name] = round(100 * max(0.0, 1 - value / threshold))
+        if value >= threshold:
+            alarms.append(name)
+    return scores, alarms
+
+
+class EngineAnalyser:
+    """
+    Buffers high-rate RPM and oil-pressure samples and analyses them off the event loop.
+
+    At most one analysis is in flight at a time. `poll` never blocks: it
+    collects a finished result if there is one and submits the next window
+    when the buffer is full, so a slow worker only delays results, never the
+    main loop.
+    """
+
+    def __init__(self, window_size: int = 256, executor_factory=None):
+        self.window_size = window_size
+        self.rpm: deque[float] = deque(maxlen=window_size)
+        self.oil_pressure: deque[float] = deque(maxlen=window_size)
+        self.sample_rate_hz: float | None = None
+
+        self.result: dict | None = None
+        self._executor_factory = executor_factory or _process_pool
+        self._executor: Executor | None = None
+        self._future: Future | None = None
+        self._fresh = 0
+
+    def add_samples(self, rpm: list[float], oil_pressure: list[float] | None, sample_rate_hz: float):
+        if sample_rate_hz != self.sample_rate_hz:
+            # Mixing sample rates would smear the spectrum
+            self.rpm.clear()
+            self.oil_pressure.clear()
+            self.sample_rate_hz = sample_rate_hz
+        self.rpm.extend(rpm)
+        if oil_pressure:
+            self.oil_pressure.extend(oil_pressure)
+        self._fresh += len(rpm)
+
+    def reset(self):
+        """Drop buffered samples, e.g. when the engine stops."""
+        self.rpm.clear()
+        self.oil_pressure.clear()
+        self._fresh = 0
+
+    def poll(self) -> dict | None:
+        """Collect a finished analysis (returned once) and submit the next window if due."""
+        result = None
+        if self._future is not None and self._future.done():
+            try:
+                result = self.result = self._future.result()
+            except Exception as e:
+                log.error(f"Engine analysis failed: {e}")
+            self._future = None
+
+        # Analyse once the window is full and at least half of it is new
+        if self._future is None and len(self.rpm) == self.window_size and self._fresh >= self.window_size // 2:
+            if self._executor is None:
+                self._executor = self._executor_factory()
+            self._fresh = 0
+            self._future = self._executor.submit(
+                analyse_window, list(self.rpm), list(self.oil_pressure), self.sample_rate_hz
+            )
+        return result
+
+    def shutdown(self):
+        """Stop the worker process, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _process_pool() -> Executor:
+    # Deferred so the worker process is only started once there is something to analyse
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Forking a process that is running gRPC and asyncio threads can deadlock the child,
+    # so the worker is started fresh; it only imports this module, not pydoover.
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
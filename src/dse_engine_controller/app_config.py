@@ -45,6 +45,55 @@ class DseEngineControllerConfig(config.Schema):
             default=60
         )
 
+        # Auto mode
+        self.min_run_minutes = config.Integer(
+            "Min Run Time (minutes)",
+            description="Minimum time an auto-started engine runs before it may be auto-stopped",
+            default=5
+        )
+
+        self.min_rest_minutes = config.Integer(
+            "Min Rest Time (minutes)",
+            description="Minimum time after stopping before the engine may be auto-started again",
+            default=2
+        )
+
+        self.exercise_interval_days = config.Integer(
+            "Exercise Interval (days)",
+            description="Days between automatic exercise runs (0 to disable)",
+            default=0
+        )
+
+        self.exercise_start_hour = config.Integer(
+            "Exercise Start Hour",
+            description="Local hour of day (0-23) at which exercise runs start",
+            default=10
+        )
+
+        self.exercise_duration_minutes = config.Integer(
+            "Exercise Duration (minutes)",
+            description="Length of an automatic exercise run",
+            default=30
+        )
+
+        self.charge_run_voltage = config.Number(
+            "Charge Run Voltage (V)",
+            description="Battery voltage below which an automatic charge run starts (0 to disable)",
+            default=0.0
+        )
+
+        self.charge_run_minutes = config.Integer(
+            "Charge Run Duration (minutes)",
+            description="Length of an automatic battery charge run",
+            default=60
+        )
+
+        self.load_demand_tag = config.String(
+            "Load Demand Tag",
+            description="Tag on this app that requests an automatic run while truthy",
+            default="load_demand"
+        )
+
         # Alarm thresholds
         self.low_oil_pressure_psi = config.Number(
             "Low Oil Pressure (PSI)",
@@ -82,6 +131,51 @@ class DseEngineControllerConfig(config.Schema):
             default=1400
         )
 
+        self.stale_data_seconds = config.Integer(
+            "Stale Data Timeout (seconds)",
+            description="Show a stale data warning if the data source has not produced a new sample for this long",
+            default=10
+        )
+
+        # Engine health analysis (high-rate RPM and oil pressure)
+        self.hunting_alarm_rpm = config.Number(
+            "Governor Hunting Alarm (RPM)",
+            description="RPM oscillation amplitude (0.2-3 Hz) at which a governor hunting alarm is raised",
+            default=25.0
+        )
+
+        self.misfire_alarm_ratio = config.Number(
+            "Misfire Alarm Ratio",
+            description="Share of RPM fluctuation at the engine cycle frequency at which a misfire alarm is raised",
+            default=0.3
+        )
+
+        self.oil_pressure_variation_psi = config.Number(
+            "Oil Pressure Variation Alarm (PSI)",
+            description="Oil pressure standard deviation at which an unstable oil pressure alarm is raised",
+            default=5.0
+        )
+
+        # Persistence
+        self.checkpoint_path = config.String(
+            "State Checkpoint Path",
+            description="Local file used to restore controller state after a restart",
+            default="/app/state/engine_controller.json"
+        )
+
+        # Diagnostics
+        self.latency_tracing = config.Boolean(
+            "Latency Tracing",
+            description="Trace each sample from the data source through alarms, state, UI and publish",
+            default=False
+        )
+
+        self.latency_report_path = config.String(
+            "Latency Report Path",
+            description="Optional local file the latency percentiles are written to",
+            default=""
+        )
+
         # Data source
         self.simulator_app_key = config.Application(
             "Simulator App Key",
@@ -1,8 +1,11 @@
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from pydoover.state import StateMachine
 
+from .start_stats import StartStatistics
+
 if TYPE_CHECKING:
     from .application import DseEngineControllerApplication
 
@@ -61,14 +64,41 @@ class EngineState:
         self.app = app
         self.crank_attempts = 0
 
+        # Transition timing (monotonic clock)
+        self.start_stats = StartStatistics()
+        self.state_entered_at = time.monotonic()
+        self._last_state = "stopped"
+
         self.state_machine = StateMachine(
             states=self.states,
             transitions=self.transitions,
             model=self,
             initial="stopped",
             queued=True,
+            after_state_change="_on_state_change",
         )
 
+    async def _on_state_change(self):
+        """Timestamp every transition and feed the start-sequence statistics."""
+        now = time.monotonic()
+        self.start_stats.record_transition(self._last_state, self.state, self.state_entered_at, now)
+        self._last_state = self.state
+        self.state_entered_at = now
+        self.app.save_checkpoint()
+
+    async def restore(self, state: str, crank_attempts: int = 0):
+        """
+        Restore a checkpointed state without running a transition.
+
+        Only settled states (stopped, running, fault) can be restored; the
+        caller is responsible for deciding which state is plausible.
+        """
+        self.state_machine.set_state(state)
+        self._last_state = state
+        self.state_entered_at = time.monotonic()
+        await getattr(self, f"on_enter_{state}")()
+        self.crank_attempts = crank_attempts
+
     async def on_enter_stopped(self):
         """Called when engine enters stopped state."""
         log.info("Engine stopped")
@@ -141,16 +171,17 @@ class EngineState:
         if self.state == "cranking" and engine_running:
             await self.engine_started()
 
-    # Type hints for dynamically created trigger methods
-    async def start_request(self): ...
-    async def crank(self): ...
-    async def engine_started(self): ...
-    async def crank_timeout(self): ...
-    async def retry_crank(self): ...
-    async def max_cranks_exceeded(self): ...
-    async def stop_request(self): ...
-    async def shutdown_complete(self): ...
-    async def immediate_stop(self): ...
-    async def fault_detected(self): ...
-    async def reset_fault(self): ...
-    async def emergency_stop(self): ...
+    # Type hints for dynamically created trigger methods (bound by the state machine at runtime)
+    if TYPE_CHECKING:
+        async def start_request(self): ...
+        async def crank(self): ...
+        async def engine_started(self): ...
+        async def crank_timeout(self): ...
+        async def retry_crank(self): ...
+        async def max_cranks_exceeded(self): ...
+        async def stop_request(self): ...
+        async def shutdown_complete(self): ...
+        async def immediate_stop(self): ...
+        async def fault_detected(self): ...
+        async def reset_fault(self): ...
+        async def emergency_stop(self): ...
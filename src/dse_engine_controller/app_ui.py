@@ -2,6 +2,8 @@ from datetime import datetime
 
 from pydoover import ui
 
+from .sample_frame import SampleFrame
+
 
 class DseEngineControllerUI:
     """
@@ -94,6 +96,22 @@ class DseEngineControllerUI:
             ]
         )
 
+        # Fuel Burn Rate (estimated)
+        self.fuel_burn_rate = ui.NumericVariable(
+            "fuel_burn_rate",
+            "Fuel Burn Rate",
+            precision=1,
+            unit="%/hr",
+        )
+
+        # Time to Empty (estimated)
+        self.fuel_time_to_empty = ui.NumericVariable(
+            "fuel_time_to_empty",
+            "Time to Empty",
+            precision=1,
+            unit="hrs",
+        )
+
         # Last Update Time
         self.last_update = ui.DateTimeVariable(
             "last_update",
@@ -125,6 +143,30 @@ class DseEngineControllerUI:
             hidden=True,
         )
 
+        self.stale_data_warning = ui.WarningIndicator(
+            "stale_data_warning",
+            "Engine Data Stale",
+            hidden=True,
+        )
+
+        self.hunting_warning = ui.WarningIndicator(
+            "hunting_warning",
+            "Governor Hunting",
+            hidden=True,
+        )
+
+        self.misfire_warning = ui.WarningIndicator(
+            "misfire_warning",
+            "Misfire Detected",
+            hidden=True,
+        )
+
+        self.oil_pressure_unstable_warning = ui.WarningIndicator(
+            "oil_pressure_unstable_warning",
+            "Oil Pressure Unstable",
+            hidden=True,
+        )
+
         # Control Actions
         self.start_engine = ui.Action(
             "start_engine",
@@ -182,12 +224,18 @@ class DseEngineControllerUI:
             self.coolant_temp,
             self.battery_voltage,
             self.fuel_level,
+            self.fuel_burn_rate,
+            self.fuel_time_to_empty,
             self.last_update,
             # Warnings
             self.low_oil_warning,
             self.high_temp_warning,
             self.low_battery_warning,
             self.overspeed_warning,
+            self.stale_data_warning,
+            self.hunting_warning,
+            self.misfire_warning,
+            self.oil_pressure_unstable_warning,
             # Controls
             self.start_engine,
             self.stop_engine,
@@ -198,23 +246,20 @@ class DseEngineControllerUI:
             self.alerts,
         )
 
-    def update_parameters(
-        self,
-        rpm: float = 0,
-        oil_pressure: float = 0,
-        coolant_temp: float = 0,
-        battery_voltage: float = 0,
-        fuel_level: float = 0,
-        engine_hours: float = 0,
-    ):
-        """Update all engine parameters."""
-        self.engine_rpm.update(rpm)
-        self.oil_pressure.update(oil_pressure)
-        self.coolant_temp.update(coolant_temp)
-        self.battery_voltage.update(battery_voltage)
-        self.fuel_level.update(fuel_level)
-        self.engine_hours.update(engine_hours)
-        self.last_update.update(datetime.now())
+    def update_parameters(self, frame: SampleFrame):
+        """Update all engine parameters from a sample frame."""
+        self.engine_rpm.update(frame.rpm)
+        self.oil_pressure.update(frame.oil_pressure)
+        self.coolant_temp.update(frame.coolant_temp)
+        self.battery_voltage.update(frame.battery_voltage)
+        self.fuel_level.update(frame.fuel_level)
+        self.engine_hours.update(frame.engine_hours)
+        self.last_update.update(datetime.fromtimestamp(frame.timestamp) if frame.timestamp else datetime.now())
+
+    def update_fuel(self, burn_rate: float | None, hours_to_empty: float | None):
+        """Update the estimated fuel burn rate and time to empty."""
+        self.fuel_burn_rate.update(burn_rate)
+        self.fuel_time_to_empty.update(hours_to_empty)
 
     def update_warnings(
         self,
@@ -222,13 +267,26 @@ class DseEngineControllerUI:
         high_temp: bool = False,
         low_battery: bool = False,
         overspeed: bool = False,
+        stale_data: bool = False,
     ):
         """Update warning indicator visibility."""
-        self.low_oil_warning.set_hidden(not low_oil)
-        self.high_temp_warning.set_hidden(not high_temp)
-        self.low_battery_warning.set_hidden(not low_battery)
-        self.overspeed_warning.set_hidden(not overspeed)
+        self.low_oil_warning.hidden = not low_oil
+        self.high_temp_warning.hidden = not high_temp
+        self.low_battery_warning.hidden = not low_battery
+        self.overspeed_warning.hidden = not overspeed
+        self.stale_data_warning.hidden = not stale_data
+
+    def update_health_warnings(
+        self,
+        hunting: bool = False,
+        misfire: bool = False,
+        oil_pressure_unstable: bool = False,
+    ):
+        """Update engine health warning indicator visibility."""
+        self.hunting_warning.hidden = not hunting
+        self.misfire_warning.hidden = not misfire
+        self.oil_pressure_unstable_warning.hidden = not oil_pressure_unstable
 
     def show_fault_reset(self, show: bool = True):
         """Show or hide the fault reset button."""
-        self.reset_fault.set_hidden(not show)
+        self.reset_fault.hidden = not show
@@ -1,16 +1,36 @@
+import asyncio
 import logging
 import json
+import time
 from datetime import datetime
 
 from pydoover.docker import Application
 from pydoover import ui
 
+from . import STARTED_AT
 from .app_config import DseEngineControllerConfig
 from .app_ui import DseEngineControllerUI
+from .analysis import EngineAnalyser, score_health
 from .app_state import EngineState
+from .auto_scheduler import AutoScheduler, AutoStartController
+from .checkpoint import StateCheckpoint
+from .command_queue import AlertBatcher, CommandQueue
+from .integrators import FuelBurnEstimator, RunHoursIntegrator
+from .sample_frame import EMPTY_FRAME, SAMPLE_FIELDS, FrameTracker, SampleFrame
+from .tracing import NULL_TRACE, LatencyTracer, Trace
 
 log = logging.getLogger(__name__)
 
+# Time allowed from container start to the first main loop after a (watchdog) restart.
+# With a responsive device agent this measures about 1.2s: ~0.5s of imports (nearly all
+# pydoover) and three fixed 0.2s waits in pydoover's startup (deployment config sync, UI
+# sync, the pause before the first loop). The rest is headroom for slower hardware; a
+# slow device agent also exceeds it, which is worth a warning after a restart.
+STARTUP_BUDGET_SECONDS = 2.0
+
+# How often accumulators are checkpointed between state transitions
+CHECKPOINT_INTERVAL_SECONDS = 60
+
 
 class DseEngineControllerApplication(Application):
     """
@@ -37,22 +57,55 @@ class DseEngineControllerApplication(Application):
         self.state: EngineState = None
         self.engine_mode: str = "manual"
 
-        # Engine parameters (read from simulator or real hardware)
-        self.rpm: float = 0
-        self.oil_pressure: float = 0
-        self.coolant_temp: float = 0
-        self.battery_voltage: float = 12.6
-        self.fuel_level: float = 100
-        self.engine_hours: float = 0
+        # Latest engine parameters (read from simulator or real hardware)
+        self.frame: SampleFrame = EMPTY_FRAME
+        self.frame_tracker: FrameTracker = None
+        self.stale_data: bool = False
 
         # Fault tracking
         self.active_faults: list[str] = []
 
+        # Engine health analysis (alarms here warn, they do not fault the engine)
+        self.analyser = EngineAnalyser()
+        self.health_alarms: list[str] = []
+
+        # Auto mode
+        self.auto_scheduler = AutoScheduler()
+        self.auto_start: AutoStartController = None
+
+        # Control commands and alerts (processed by background tasks)
+        self.commands: CommandQueue = None
+        self.alerts: AlertBatcher = None
+        self._background_tasks: list[asyncio.Task] = []
+
+        # Run time and fuel accumulators (checkpointed so they survive restarts)
+        self.run_hours = RunHoursIntegrator()
+        self.fuel_burn = FuelBurnEstimator()
+
+        # Persistence
+        self.checkpoint: StateCheckpoint = None
+        self.checkpointed_at: float = 0
+        # Restored checkpoint waiting for a frame with live RPM (tags are not synced yet during setup)
+        self.pending_checkpoint: dict | None = None
+        self.pending_checkpoint_since: float = None
+        self.startup_seconds: float = None
+
+        # Diagnostics
+        self.tracer: LatencyTracer = None
+        self._ui_pending_trace: Trace | None = None
+
     async def setup(self):
         """Initialize UI, state machine, and resources."""
         self.ui = DseEngineControllerUI()
         self.state = EngineState(self)
+        self.frame_tracker = FrameTracker(self.config.stale_data_seconds.value)
+        self.tracer = LatencyTracer(
+            enabled=self.config.latency_tracing.value,
+            report_path=self.config.latency_report_path.value,
+        )
         self.ui_manager.add_children(*self.ui.fetch())
+        self._setup_auto_start()
+        self._setup_commands()
 
         # Set display name from config
         display_name = self.config.display_name.value or "Engine Controller"
@@ -61,30 +114,209 @@ class DseEngineControllerApplication(Application):
         # Initialize UI state
         self.ui.engine_status.update("Stopped")
 
+        # Resume from the last checkpoint (the engine may still be running or latched in a fault)
+        self.checkpoint = StateCheckpoint(self.config.checkpoint_path.value)
+        await self._restore_checkpoint()
+
         log.info(f"DSE Engine Controller initialized: {display_name}")
 
+    async def close(self):
+        """Stop the analysis worker process along with the app."""
+        self.analyser.shutdown()
+        await super().close()
+
+    def _setup_commands(self):
+        """Create the command queue and alert batcher and start their background tasks."""
+        self.commands = CommandQueue({
+            "start": self._handle_start,
+            "stop": self._handle_stop,
+            "emergency_stop": self._handle_emergency_stop,
+            "reset_fault": self._handle_reset_fault,
+            "engine_mode": self._handle_engine_mode,
+        })
+        self.alerts = AlertBatcher(self._send_alert)
+        self._background_tasks = [
+            asyncio.create_task(self.commands.run()),
+            asyncio.create_task(self.alerts.run()),
+        ]
+
+    async def _send_alert(self, message: str):
+        """Send an alert to the UI's notification banner."""
+        # The AlertStream element displays whatever is published on the significantEvent channel
+        sent = await self.publish_to_channel("significantEvent", {"notification_msg": message})
+        if sent is False:
+            raise RuntimeError("device agent did not accept the alert")
+
+    def _setup_auto_start(self):
+        """Create the auto start/stop controller and register its run rules."""
+        self.auto_start = AutoStartController(
+            self.state,
+            self.auto_scheduler,
+            min_run_seconds=self.config.min_run_minutes.value * 60,
+            min_rest_seconds=self.config.min_rest_minutes.value * 60,
+        )
+        self.auto_start.add_exercise_schedule(
+            self.config.exercise_interval_days.value,
+            self.config.exercise_start_hour.value,
+            self.config.exercise_duration_minutes.value * 60,
+        )
+        self.auto_start.add_battery_charge_run(
+            self.config.charge_run_voltage.value,
+            self.config.charge_run_minutes.value * 60,
+        )
+
+        load_demand_tag = self.config.load_demand_tag.value
+        if load_demand_tag:
+            self.auto_start.add_load_demand()
+            self.subscribe_to_tag(load_demand_tag, self._on_load_demand)
+
+    async def _on_load_demand(self, tag_key, new_value):
+        """Feed load-demand tag changes into the auto scheduler."""
+        await self.auto_scheduler.update_input(self.auto_start.input_name("load_demand"), new_value)
+
+    async def _restore_checkpoint(self):
+        """
+        Restore controller state from the checkpoint.
+
+        Latched faults are restored straight away. Any other state depends on
+        whether the engine is actually running, which is unknown until a frame
+        with RPM arrives (tags have not synced yet during setup), so it is held
+        in `pending_checkpoint` and resumed from the main loop. The checkpoint
+        file is not written until then. If no RPM arrives within the stale data
+        timeout, the engine is assumed stopped and the operator is alerted.
+        """
+        saved = self.checkpoint.load()
+        if saved is None:
+            log.info("No checkpoint found, starting in stopped state")
+            return
+
+        accumulators = saved.get("accumulators") or {}
+        self.run_hours.restore(accumulators.get("run_hours"))
+        self.fuel_burn.restore(accumulators.get("fuel_burn"))
+        await self.auto_start.restore(saved.get("auto_start"))
+
+        self.engine_mode = saved.get("engine_mode", "manual")
+        self.ui.engine_mode.coerce(self.engine_mode)
+
+        if saved.get("state") == "fault" or not self.config.simulator_app_key.value:
+            # Faults stay latched regardless of RPM; without a data source there is no RPM to wait for
+            await self._resume_checkpoint(saved, engine_running=False)
+        else:
+            log.info(f"Checkpoint state {saved.get('state')} held until engine RPM is known")
+            self.pending_checkpoint = saved
+            self.pending_checkpoint_since = time.monotonic()
+            self.ui.engine_status.update("Waiting for engine data")
+
+    async def _resume_checkpoint(self, saved: dict, engine_running: bool):
+        """Resume the checkpointed state, checked against whether the engine is running."""
+        self.pending_checkpoint = None
+
+        saved_state = saved.get("state")
+        if saved_state == "fault":
+            # Faults stay latched until reset, regardless of what the engine is doing
+            restored = "fault"
+        elif engine_running:
+            # Mid-start states resolved while we were down; cooldown restarts from running below
+            restored = "running"
+        else:
+            if saved_state not in ("stopped", None):
+                log.warning(f"Checkpoint state {saved_state} not plausible with the engine stopped, assuming stopped")
+            restored = "stopped"
+
+        self.active_faults = list(saved.get("active_faults", [])) if restored == "fault" else []
+        await self.state.restore(restored, crank_attempts=saved.get("crank_attempts", 0) if restored == "fault" else 0)
+        if saved_state == "cooling_down" and restored == "running":
+            await self.state.stop_request()
+
+        await self._update_auto_start_enabled()
+
+        log.info(f"Restored checkpoint: state={self.state.state} (saved {saved_state}), mode={self.engine_mode}")
+
+    async def _update_auto_start_enabled(self):
+        """Enable auto start/stop in auto mode, once the engine's state is known."""
+        await self.auto_start.set_enabled(
+            self.engine_mode == "auto" and self.config.auto_start_enabled.value and self.pending_checkpoint is None
+        )
+
+    def save_checkpoint(self):
+        """Write the current controller state to the checkpoint file."""
+        if self.checkpoint is None or self.pending_checkpoint is not None:
+            return
+        self.checkpoint.save({
+            "state": self.state.state,
+            "crank_attempts": self.state.crank_attempts,
+            "active_faults": self.active_faults,
+            "engine_mode": self.engine_mode,
+            "accumulators": {
+                "run_hours": self.run_hours.to_dict(),
+                "fuel_burn": self.fuel_burn.to_dict(),
+            },
+            "auto_start": self.auto_start.to_dict(),
+            "saved_at": time.time(),
+        })
+        self.checkpointed_at = time.monotonic()
+
     async def main_loop(self):
         """Main application loop - read sensors, evaluate state, update UI."""
+        if self.startup_seconds is None:
+            self.startup_seconds = time.monotonic() - STARTED_AT
+            log.info(f"First main loop {self.startup_seconds:.2f}s after start")
+            if self.startup_seconds > STARTUP_BUDGET_SECONDS:
+                log.warning(f"Startup exceeded budget of {STARTUP_BUDGET_SECONDS}s")
+            await self.set_tag("startup_seconds", round(self.startup_seconds, 3))
+
         # Read engine parameters from simulator or hardware
-        await self._read_engine_parameters()
-
-        # Check alarm conditions
-        self._evaluate_alarms()
-
-        # Evaluate state machine
-        engine_running = self.rpm > 100
-        fault_active = len(self.active_faults) > 0
-        await self.state.evaluate_state(engine_running, fault_active)
-
-        # Update UI
-        self.ui.update_parameters(
-            rpm=self.rpm,
-            oil_pressure=self.oil_pressure,
-            coolant_temp=self.coolant_temp,
-            battery_voltage=self.battery_voltage,
-            fuel_level=self.fuel_level,
-            engine_hours=self.engine_hours,
-        )
+        frame = await self._read_engine_parameters()
+        new_frame = frame is not None and self.frame_tracker.accept(frame)
+        trace = NULL_TRACE
+        if new_frame:
+            self.frame = frame
+            trace = self.tracer.begin(frame)
+            self._record_start_rpm(frame)
+
+        if self.pending_checkpoint is not None:
+            if self.frame.rpm is not None:
+                await self._resume_checkpoint(self.pending_checkpoint, self.frame.engine_running)
+            elif time.monotonic() - self.pending_checkpoint_since >= self.config.stale_data_seconds.value:
+                # Never wait forever (e.g. the data source is down): control must come back to the operator
+                log.warning("No engine RPM since restart, resuming checkpoint with the engine assumed stopped")
+                self.alerts.add("No engine data since restart: engine state unknown, assuming stopped", urgent=True)
+                await self._resume_checkpoint(self.pending_checkpoint, engine_running=False)
+
+        # A configured source that stops advancing raises a warning. It is not a fault: an uplink
+        # hiccup must not latch the engine in fault, and there is nothing wrong with the engine itself.
+        stale = bool(self.config.simulator_app_key.value) and self.frame_tracker.is_stale()
+        if stale != self.stale_data:
+            if stale:
+                log.warning(f"Engine data stale: no new sample for {self.frame_tracker.stale_after_seconds}s")
+            else:
+                log.info("Engine data source resumed")
+            self.stale_data = stale
+            await self.set_tag("stale_data", stale)
+
+        # Auto mode: feed inputs (only changed values trigger conditions) and fire due timers
+        await self.auto_scheduler.update_input(self.auto_start.input_name("battery_voltage"), self.frame.battery_voltage)
+        await self.auto_scheduler.update_input(self.auto_start.input_name("engine_state"), self.state.state)
+        await self.auto_scheduler.run_due()
+
+        # Only re-evaluate alarms and the state machine for frames not already processed,
+        # and not while the state to resume is still unknown
+        if new_frame and self.pending_checkpoint is None:
+            self._evaluate_alarms(self.frame)
+            trace.mark("alarms")
+            await self.state.evaluate_state(self.frame.engine_running, len(self.active_faults) > 0)
+            trace.mark("state")
+
+        if new_frame:
+            self._update_accumulators(self.frame)
+            self.ui.update_parameters(self.frame)
+            self.ui.update_fuel(self.fuel_burn.burn_rate, self.fuel_burn.hours_to_empty)
+            if self.frame.engine_hours is None:
+                self.ui.engine_hours.update(self.run_hours.hours)
+            trace.mark("ui_staged")
+
+        # Engine health analysis runs in a worker; this only hands over samples and collects results
+        await self._update_engine_health(self.frame if new_frame else None)
 
         # Update warning indicators
         self.ui.update_warnings(
@@ -92,6 +324,7 @@ class DseEngineControllerApplication(Application):
             high_temp="high_coolant_temp" in self.active_faults,
             low_battery="low_battery_voltage" in self.active_faults,
             overspeed="overspeed" in self.active_faults,
+            stale_data=self.stale_data,
         )
 
         # Show/hide fault reset button based on state
@@ -99,60 +332,155 @@ class DseEngineControllerApplication(Application):
 
         # Persist state to tags
         await self.set_tag("engine_state", self.state.state)
-        await self.set_tag("engine_rpm", self.rpm)
-        await self.set_tag("oil_pressure", self.oil_pressure)
-        await self.set_tag("coolant_temp", self.coolant_temp)
-        await self.set_tag("battery_voltage", self.battery_voltage)
-        await self.set_tag("fuel_level", self.fuel_level)
         await self.set_tag("active_faults", self.active_faults)
-
-        # Publish to data channel
-        await self._publish_engine_data()
+        await self.set_tag("start_stats", self.state.start_stats.to_dict())
+        if new_frame:
+            await self.set_tag("engine_rpm", self.frame.rpm)
+            await self.set_tag("oil_pressure", self.frame.oil_pressure)
+            await self.set_tag("coolant_temp", self.frame.coolant_temp)
+            await self.set_tag("battery_voltage", self.frame.battery_voltage)
+            await self.set_tag("fuel_level", self.frame.fuel_level)
+            await self.set_tag("sample_sequence", self.frame.sequence)
+            await self.set_tag("run_hours", round(self.run_hours.hours, 3))
+            await self.set_tag("fuel_burn_rate", _round(self.fuel_burn.burn_rate, 2))
+            await self.set_tag("fuel_hours_to_empty", _round(self.fuel_burn.hours_to_empty, 2))
+
+            # Publish to data channel
+            await self._publish_engine_data(self.frame)
+            trace.mark("published")
+            if isinstance(trace, Trace):
+                # Finished once the UI has actually been sent, see _update_ui
+                self._ui_pending_trace = trace
+
+        if time.monotonic() - self.checkpointed_at >= CHECKPOINT_INTERVAL_SECONDS:
+            self.save_checkpoint()
+
+        if self.tracer.export_due():
+            await self.set_tag("latency_stats", self.tracer.export())
 
         log.debug(
-            f"State: {self.state.state}, RPM: {self.rpm}, "
-            f"Oil: {self.oil_pressure} PSI, Temp: {self.coolant_temp} C"
+            f"State: {self.state.state}, Frame: {self.frame.sequence}, RPM: {self.frame.rpm}, "
+            f"Oil: {self.frame.oil_pressure} PSI, Temp: {self.frame.coolant_temp} C"
+        )
+
+    def _record_start_rpm(self, frame: SampleFrame):
+        """Feed RPM to the start statistics while cranking, using the high-rate window if the source sends one."""
+        if self.state.state != "cranking":
+            return
+        if frame.rpm_samples and frame.sample_rate_hz:
+            last = len(frame.rpm_samples) - 1
+            for i, rpm in enumerate(frame.rpm_samples):
+                self.state.start_stats.record_rpm(rpm, frame.received_at - (last - i) / frame.sample_rate_hz)
+        elif frame.rpm is not None:
+            self.state.start_stats.record_rpm(frame.rpm, frame.received_at)
+
+    async def _update_ui(self, force_log: bool = False):
+        """Send staged UI changes (called by pydoover at the start of each loop)."""
+        await super()._update_ui(force_log)
+        if self._ui_pending_trace is not None:
+            self._ui_pending_trace.mark("ui_sent")
+            self.tracer.finish(self._ui_pending_trace)
+            self._ui_pending_trace = None
+
+    def _update_accumulators(self, frame: SampleFrame):
+        """Advance the run-hour and fuel-burn accumulators with a new frame."""
+        self.run_hours.update(frame.engine_running, frame.received_at)
+        # Fuel only falls while running; level changes while stopped (refills, sender drift) are not burn.
+        # Fitted against running hours, so a stop does not read as a stretch of zero burn.
+        if frame.engine_running and frame.fuel_level is not None:
+            self.fuel_burn.update(frame.fuel_level, self.run_hours.hours)
+
+    async def _update_engine_health(self, frame: SampleFrame | None):
+        """Feed high-rate samples to the analyser and publish any finished analysis."""
+        if frame is not None:
+            if frame.engine_running and frame.rpm_samples and frame.sample_rate_hz:
+                self.analyser.add_samples(frame.rpm_samples, frame.oil_pressure_samples, frame.sample_rate_hz)
+            elif not frame.engine_running:
+                self.analyser.reset()
+                if self.health_alarms:
+                    self.health_alarms = []
+                    self.ui.update_health_warnings()
+
+        result = self.analyser.poll()
+        if result is None or not self.frame.engine_running:
+            return
+
+        scores, alarms = score_health(result, {
+            "hunting_amplitude_rpm": self.config.hunting_alarm_rpm.value,
+            "misfire_ratio": self.config.misfire_alarm_ratio.value,
+            "oil_pressure_std_psi": self.config.oil_pressure_variation_psi.value,
+        })
+        for alarm in alarms:
+            if alarm not in self.health_alarms:
+                log.warning(f"Engine health alarm: {alarm} ({result[alarm]:.2f})")
+        self.health_alarms = alarms
+
+        self.ui.update_health_warnings(
+            hunting="hunting_amplitude_rpm" in alarms,
+            misfire="misfire_ratio" in alarms,
+            oil_pressure_unstable="oil_pressure_std_psi" in alarms,
         )
+        await self.set_tag("engine_health", {"scores": scores, "alarms": alarms, "indicators": result})
 
-    async def _read_engine_parameters(self):
-        """Read engine parameters from simulator or hardware."""
+    async def _read_engine_parameters(self) -> SampleFrame | None:
+        """
+        Read a sample frame from the simulator or hardware.
+
+        Returns the current frame if the source has not produced a new sample,
+        or None if there is no data source or nothing has been received from it yet.
+        """
         # Try to read from simulator app if configured
         sim_key = self.config.simulator_app_key.value
-        if sim_key:
-            self.rpm = self.get_tag("rpm", sim_key) or 0
-            self.oil_pressure = self.get_tag("oil_pressure", sim_key) or 0
-            self.coolant_temp = self.get_tag("coolant_temp", sim_key) or 0
-            self.battery_voltage = self.get_tag("battery_voltage", sim_key) or 12.6
-            self.fuel_level = self.get_tag("fuel_level", sim_key) or 100
-            self.engine_hours = self.get_tag("engine_hours", sim_key) or 0
-        else:
+        if not sim_key:
             # In real implementation, read from hardware/Modbus/CAN
-            # For now, use stored values (modified by state machine simulation)
-            pass
+            return None
+
+        values = tuple(self.get_tag(name, sim_key) for name in SAMPLE_FIELDS)
+        source_sequence = self.get_tag("sample_seq", sim_key)
+        if source_sequence is None and all(v is None for v in values):
+            # e.g. tags not synced yet after a restart
+            return None
+
+        sequence = self.frame_tracker.next_sequence(source_sequence, values)
+        if sequence == self.frame.sequence:
+            return self.frame
+
+        return SampleFrame(
+            sequence=sequence,
+            timestamp=self.get_tag("sample_ts", sim_key),
+            received_at=time.monotonic(),
+            trace_id=self.get_tag("trace_id", sim_key),
+            source_monotonic=self.get_tag("sample_mono", sim_key),
+            rpm_samples=self.get_tag("rpm_samples", sim_key),
+            oil_pressure_samples=self.get_tag("oil_pressure_samples", sim_key),
+            sample_rate_hz=self.get_tag("sample_rate_hz", sim_key),
+            **dict(zip(SAMPLE_FIELDS, values)),
+        )
 
-    def _evaluate_alarms(self):
-        """Check engine parameters against alarm thresholds."""
+    def _evaluate_alarms(self, frame: SampleFrame):
+        """Check a sample frame against alarm thresholds. Missing parameters raise no alarm of their own."""
         new_faults = []
 
         # Only check these alarms when engine is running
-        if self.rpm > 100:
+        if frame.engine_running:
             # Low oil pressure (critical when running)
-            if self.oil_pressure < self.config.low_oil_pressure_psi.value:
+            if frame.oil_pressure is not None and frame.oil_pressure < self.config.low_oil_pressure_psi.value:
                 new_faults.append("low_oil_pressure")
 
             # High coolant temperature
-            if self.coolant_temp > self.config.high_coolant_temp_c.value:
+            if frame.coolant_temp is not None and frame.coolant_temp > self.config.high_coolant_temp_c.value:
                 new_faults.append("high_coolant_temp")
 
             # Overspeed
-            if self.rpm > self.config.overspeed_rpm.value:
+            if frame.rpm > self.config.overspeed_rpm.value:
                 new_faults.append("overspeed")
 
         # Battery voltage - always check
-        if self.battery_voltage < self.config.low_battery_voltage.value:
-            new_faults.append("low_battery_voltage")
-        elif self.battery_voltage > self.config.high_battery_voltage.value:
-            new_faults.append("high_battery_voltage")
+        if frame.battery_voltage is not None:
+            if frame.battery_voltage < self.config.low_battery_voltage.value:
+                new_faults.append("low_battery_voltage")
+            elif frame.battery_voltage > self.config.high_battery_voltage.value:
+                new_faults.append("high_battery_voltage")
 
         # Log new faults
         for fault in new_faults:
@@ -164,84 +492,129 @@ class DseEngineControllerApplication(Application):
             if fault not in new_faults:
                 log.info(f"Fault cleared: {fault}")
 
-        self.active_faults = new_faults
+        if new_faults != self.active_faults:
+            self.active_faults = new_faults
+            self.save_checkpoint()
 
-    async def _publish_engine_data(self):
-        """Publish engine data to channel for logging."""
+    async def _publish_engine_data(self, frame: SampleFrame):
+        """Publish a sample frame to channel for logging."""
         data = {
             "timestamp": datetime.now().isoformat(),
             "state": self.state.state,
-            "rpm": self.rpm,
-            "oil_pressure": self.oil_pressure,
-            "coolant_temp": self.coolant_temp,
-            "battery_voltage": self.battery_voltage,
-            "fuel_level": self.fuel_level,
-            "engine_hours": self.engine_hours,
+            "sequence": frame.sequence,
+            "trace_id": frame.trace_id,
+            "source_timestamp": frame.timestamp,
+            "rpm": frame.rpm,
+            "oil_pressure": frame.oil_pressure,
+            "coolant_temp": frame.coolant_temp,
+            "battery_voltage": frame.battery_voltage,
+            "fuel_level": frame.fuel_level,
+            "engine_hours": frame.engine_hours,
             "faults": self.active_faults,
         }
         await self.publish_to_channel("engine_data", json.dumps(data))
 
     # UI Callbacks
+    #
+    # Callbacks only queue the command so repeated presses from several users
+    # coalesce instead of piling up behind the state machine; see _handle_*.
 
     @ui.callback("start_engine")
     async def on_start_engine(self, new_value):
         """Handle start engine button press."""
         log.info("Start engine requested")
-
-        if self.state.state == "stopped":
-            await self.state.start_request()
-            await self.ui.alerts.send_alert("Engine start sequence initiated")
-        else:
-            log.warning(f"Cannot start engine from state: {self.state.state}")
-
+        self.commands.submit("start")
         self.ui.start_engine.coerce(None)
 
     @ui.callback("stop_engine")
     async def on_stop_engine(self, new_value):
         """Handle stop engine button press."""
         log.info("Stop engine requested")
-
-        if self.state.state == "running":
-            await self.state.stop_request()
-            await self.ui.alerts.send_alert("Engine stop sequence initiated")
-        else:
-            log.warning(f"Cannot stop engine from state: {self.state.state}")
-
+        self.commands.submit("stop")
         self.ui.stop_engine.coerce(None)
 
     @ui.callback("emergency_stop")
     async def on_emergency_stop(self, new_value):
         """Handle emergency stop button press."""
         log.warning("EMERGENCY STOP activated!")
-
-        await self.state.emergency_stop()
-        await self.ui.alerts.send_alert("EMERGENCY STOP ACTIVATED!")
-
+        self.commands.submit("emergency_stop")
         self.ui.emergency_stop.coerce(None)
 
     @ui.callback("reset_fault")
     async def on_reset_fault(self, new_value):
         """Handle fault reset button press."""
         log.info("Fault reset requested")
+        self.commands.submit("reset_fault")
+        self.ui.reset_fault.coerce(None)
 
+    @ui.callback("engine_mode")
+    async def on_engine_mode_change(self, new_value):
+        """Handle engine mode change."""
+        log.info(f"Engine mode change requested: {new_value}")
+        self.commands.submit("engine_mode", new_value)
+
+    # Command handlers (run one at a time from the command queue)
+
+    async def _handle_start(self, _):
+        if self.pending_checkpoint is not None:
+            log.warning("Cannot start engine until its state is known")
+        elif self.state.state == "stopped":
+            await self.state.start_request()
+            self.alerts.add("Engine start sequence initiated")
+        else:
+            log.warning(f"Cannot start engine from state: {self.state.state}")
+
+    async def _handle_stop(self, _):
+        if self.pending_checkpoint is not None:
+            log.warning("Cannot stop engine until its state is known")
+            return
+        # An operator's stop must not be undone by auto mode restarting the engine once it has stopped
+        if self.engine_mode == "auto":
+            await self._leave_auto_mode()
+            self.alerts.add("Auto mode switched to manual by stop request")
+        if self.state.state == "running":
+            await self.state.stop_request()
+            self.alerts.add("Engine stop sequence initiated")
+        else:
+            log.warning(f"Cannot stop engine from state: {self.state.state}")
+
+    async def _handle_emergency_stop(self, _):
+        # Whatever state a restored checkpoint was waiting to resolve, the engine is now being stopped
+        self.pending_checkpoint = None
+        # Never let auto mode restart an engine that was emergency stopped
+        await self._leave_auto_mode()
+        await self.state.emergency_stop()
+        self.alerts.add("EMERGENCY STOP ACTIVATED!", urgent=True)
+
+    async def _leave_auto_mode(self):
+        """Switch to manual mode so auto start/stop no longer acts on the engine."""
+        if self.engine_mode == "auto":
+            log.info("Engine mode changed to: manual (leaving auto)")
+            self.engine_mode = "manual"
+            self.ui.engine_mode.coerce("manual")
+            self.save_checkpoint()
+        await self.auto_start.set_enabled(False)
+
+    async def _handle_reset_fault(self, _):
         if self.state.state == "fault":
             self.active_faults = []
             await self.state.reset_fault()
-            await self.ui.alerts.send_alert("Fault reset - engine ready")
+            self.alerts.add("Fault reset - engine ready")
         else:
             log.warning("No fault to reset")
 
-        self.ui.reset_fault.coerce(None)
-
-    @ui.callback("engine_mode")
-    async def on_engine_mode_change(self, new_value):
-        """Handle engine mode change."""
+    async def _handle_engine_mode(self, new_value):
         log.info(f"Engine mode changed to: {new_value}")
         self.engine_mode = new_value
+        self.save_checkpoint()
+
+        await self._update_auto_start_enabled()
 
         if new_value == "off" and self.state.state == "running":
             await self.state.stop_request()
-        elif new_value == "auto":
-            # Auto mode would start based on external conditions
-            # (e.g., load demand, schedule, etc.)
-            pass
+        elif new_value == "auto" and not self.config.auto_start_enabled.value:
+            log.warning("Auto mode selected but auto start is disabled in config")
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    return None if value is None else round(value, digits)
@@ -0,0 +1,357 @@
+import heapq
+import inspect
+import itertools
+import logging
+import time
+from datetime import datetime, time as day_time, timedelta, tzinfo
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable
+
+if TYPE_CHECKING:
+    from .app_state import EngineState
+
+log = logging.getLogger(__name__)
+
+Callback = Callable[[], Awaitable[Any] | Any]
+
+
+class TimerHandle:
+    """Handle for a scheduled callback. Cancelled timers are dropped lazily when they reach the top of the heap."""
+
+    __slots__ = ("due", "callback", "cancelled")
+
+    def __init__(self, due: float, callback: Callback):
+        self.due = due
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class ConditionTrigger:
+    """
+    Edge-triggered condition over one or more named inputs.
+
+    `predicate` receives the current input values (in the order of `inputs`)
+    and `on_change` is called with the new boolean result whenever it flips.
+    """
+
+    __slots__ = ("inputs", "predicate", "on_change", "active")
+
+    def __init__(self, inputs: tuple[Hashable, ...], predicate: Callable[..., bool], on_change: Callable[[bool], Any]):
+        self.inputs = inputs
+        self.predicate = predicate
+        self.on_change = on_change
+        self.active = False
+
+
+class AutoScheduler:
+    """
+    Timer heap and change-driven condition engine.
+
+    Timers live in a binary heap keyed on monotonic due time, so polling costs
+    O(1) when nothing is due and O(log n) per fired timer. Conditions are
+    indexed by input name and are only evaluated when one of their inputs
+    changes value, so the cost of an input update is proportional to the
+    number of conditions that read it rather than to the total number of
+    conditions. Input names are arbitrary hashables, which lets one scheduler
+    serve many engines by namespacing their inputs (e.g. ``("gen1", "battery_voltage")``).
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], datetime] = lambda: datetime.now().astimezone(),
+    ):
+        self.clock = clock
+        # Timezone-aware wall clock, used to place calendar timers
+        self.wall_clock = wall_clock
+        self._timers: list[tuple[float, int, TimerHandle]] = []
+        self._counter = itertools.count()
+        self._inputs: dict[Hashable, Any] = {}
+        self._conditions: dict[Hashable, list[ConditionTrigger]] = {}
+
+    def call_at(self, due: float, callback: Callback) -> TimerHandle:
+        """Schedule `callback` at monotonic time `due`."""
+        handle = TimerHandle(due, callback)
+        heapq.heappush(self._timers, (due, next(self._counter), handle))
+        return handle
+
+    def call_later(self, delay: float, callback: Callback) -> TimerHandle:
+        """Schedule `callback` `delay` seconds from now."""
+        return self.call_at(self.clock() + delay, callback)
+
+    def call_at_time(self, when: datetime, callback: Callback) -> TimerHandle:
+        """Schedule `callback` at timezone-aware wall-clock time `when`."""
+        # Elapsed time from timestamps: subtracting datetimes that share a tzinfo ignores DST changes
+        return self.call_later(max(0.0, when.timestamp() - self.wall_clock().timestamp()), callback)
+
+    @property
+    def next_due(self) -> float | None:
+        """Due time of the next live timer."""
+        while self._timers and self._timers[0][2].cancelled:
+            heapq.heappop(self._timers)
+        return self._timers[0][0] if self._timers else None
+
+    async def run_due(self):
+        """Run every timer that has come due."""
+        now = self.clock()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, handle = heapq.heappop(self._timers)
+            if not handle.cancelled:
+                await _call(handle.callback)
+
+    def add_condition(
+        self,
+        inputs: Hashable | tuple[Hashable, ...],
+        predicate: Callable[..., bool],
+        on_change: Callable[[bool], Any],
+    ) -> ConditionTrigger:
+        """Register a condition over `inputs` (a single name or a tuple of names)."""
+        if not isinstance(inputs, tuple):
+            inputs = (inputs,)
+        condition = ConditionTrigger(inputs, predicate, on_change)
+        for name in inputs:
+            self._conditions.setdefault(name, []).append(condition)
+        return condition
+
+    async def update_input(self, name: Hashable, value: Any):
+        """Set an input value, evaluating the conditions that read it only if it changed."""
+        if name in self._inputs and self._inputs[name] == value:
+            return
+        self._inputs[name] = value
+
+        for condition in self._conditions.get(name, ()):
+            values = [self._inputs.get(n) for n in condition.inputs]
+            if any(v is None for v in values):
+                active = False
+            else:
+                try:
+                    active = bool(condition.predicate(*values))
+                except Exception as e:
+                    log.error(f"Error evaluating auto condition on {condition.inputs}: {e}")
+                    continue
+
+            if active != condition.active:
+                condition.active = active
+                await _call(condition.on_change, active)
+
+
+class AutoStartController:
+    """
+    Automatic start/stop of a single engine.
+
+    The engine is wanted while at least one run reason is active:
+        - exercise: calendar exercise run every N days at a set hour
+        - battery_charge: charge run after battery voltage falls below a threshold
+        - load_demand: a load-demand tag is truthy
+
+    Starts honour a minimum rest time since the engine last stopped, and
+    stops honour a minimum run time. The controller only acts while
+    `enabled` is True (auto mode selected and auto start allowed).
+
+    Exercise runs are placed on the local calendar (`tz`, or the system
+    timezone if None) counting from the last exercise run, which is kept in
+    `to_dict` so a restart does not bring the next run forward.
+    """
+
+    def __init__(
+        self,
+        engine: "EngineState",
+        scheduler: AutoScheduler,
+        min_run_seconds: float = 0,
+        min_rest_seconds: float = 0,
+        namespace: Hashable = None,
+        tz: tzinfo | None = None,
+    ):
+        self.engine = engine
+        self.scheduler = scheduler
+        self.min_run_seconds = min_run_seconds
+        self.min_rest_seconds = min_rest_seconds
+        self.namespace = namespace
+        self.tz = tz
+
+        self.enabled = False
+        self.run_reasons: set[str] = set()
+
+        # (interval_days, start_hour, duration_seconds) of the exercise schedule, if any
+        self.exercise: tuple[int, int, float] | None = None
+        self.last_exercise_at: datetime | None = None
+
+        self._recheck_timer: TimerHandle | None = None
+        self._exercise_timer: TimerHandle | None = None
+
+        # Re-check whenever the engine settles in stopped or running (e.g. after cooldown or a fault reset)
+        self.scheduler.add_condition(
+            self.input_name("engine_state"), lambda s: s in ("stopped", "running"), self._on_engine_settled
+        )
+
+    def input_name(self, name: str) -> Hashable:
+        """Scheduler input name for one of this engine's inputs."""
+        return name if self.namespace is None else (self.namespace, name)
+
+    # Rule setup
+
+    def add_exercise_schedule(self, interval_days: int, start_hour: int, duration_seconds: float):
+        """Run the engine for `duration_seconds` every `interval_days` days, starting at `start_hour` local time."""
+        if interval_days <= 0 or duration_seconds <= 0:
+            return
+        self.exercise = (interval_days, start_hour % 24, duration_seconds)
+        self._schedule_exercise()
+
+    def next_exercise_at(self) -> datetime | None:
+        """
+        Wall-clock time of the next exercise run.
+
+        `interval_days` calendar days after the last run, at the start hour. A
+        run missed while the controller was down happens at the next start
+        hour instead. Each run is placed on the calendar afresh, so DST
+        changes do not shift the start hour.
+        """
+        if self.exercise is None:
+            return None
+        interval_days, start_hour, _ = self.exercise
+        now = self.scheduler.wall_clock()
+
+        if self.last_exercise_at is not None:
+            day = self.last_exercise_at.astimezone(self.tz).date() + timedelta(days=interval_days)
+            when = self._local_time(day, start_hour)
+            if when > now:
+                return when
+
+        when = self._local_time(now.astimezone(self.tz).date(), start_hour)
+        if when <= now:
+            when = self._local_time(when.date() + timedelta(days=1), start_hour)
+        return when
+
+    def _local_time(self, day, hour: int) -> datetime:
+        naive = datetime.combine(day, day_time(hour))
+        # A naive astimezone() takes the system timezone's offset for that date, DST included
+        return naive.replace(tzinfo=self.tz) if self.tz is not None else naive.astimezone()
+
+    def _schedule_exercise(self):
+        if self._exercise_timer is not None:
+            self._exercise_timer.cancel()
+        when = self.next_exercise_at()
+        log.info(f"Auto: next exercise run at {when.isoformat()}")
+        self._exercise_timer = self.scheduler.call_at_time(when, lambda: self._start_exercise(when))
+
+    async def _start_exercise(self, slot: datetime):
+        log.info("Auto: exercise run starting")
+        self.last_exercise_at = slot
+        self._schedule_exercise()
+        self.scheduler.call_later(self.exercise[2], self._end_exercise)
+        await self.add_reason("exercise")
+
+    async def _end_exercise(self):
+        log.info("Auto: exercise run complete")
+        await self.remove_reason("exercise")
+
+    def add_battery_charge_run(self, voltage_threshold: float, duration_seconds: float):
+        """Run the engine for `duration_seconds` whenever battery voltage falls below `voltage_threshold`."""
+        if voltage_threshold <= 0 or duration_seconds <= 0:
+            return
+
+        async def on_low_battery(active: bool):
+            if not active:
+                return
+            log.info(f"Auto: battery below {voltage_threshold} V, starting charge run")
+            await self.add_reason("battery_charge")
+            self.scheduler.call_later(duration_seconds, lambda: self.remove_reason("battery_charge"))
+
+        self.scheduler.add_condition(
+            self.input_name("battery_voltage"), lambda v: v < voltage_threshold, on_low_battery
+        )
+
+    def add_load_demand(self):
+        """Run the engine while the `load_demand` input is truthy."""
+
+        async def on_load_demand(active: bool):
+            if active:
+                await self.add_reason("load_demand")
+            else:
+                await self.remove_reason("load_demand")
+
+        self.scheduler.add_condition(self.input_name("load_demand"), bool, on_load_demand)
+
+    # Persistence
+
+    def to_dict(self) -> dict:
+        return {"last_exercise_at": self.last_exercise_at.isoformat() if self.last_exercise_at else None}
+
+    async def restore(self, data: dict | None):
+        """Restore the last exercise run, rescheduling from it and resuming it if it was cut short."""
+        if not data or not data.get("last_exercise_at"):
+            return
+        try:
+            last = datetime.fromisoformat(data["last_exercise_at"])
+            if last.tzinfo is None:
+                raise ValueError("no timezone")
+        except (TypeError, ValueError) as e:
+            log.warning(f"Ignoring bad last exercise time in checkpoint {data['last_exercise_at']!r}: {e}")
+            return
+
+        self.last_exercise_at = last
+        if self.exercise is None:
+            return
+        self._schedule_exercise()
+
+        remaining = self.exercise[2] - (self.scheduler.wall_clock().timestamp() - last.timestamp())
+        if remaining > 0:
+            log.info(f"Auto: resuming exercise run, {remaining:.0f}s left")
+            self.scheduler.call_later(remaining, self._end_exercise)
+            await self.add_reason("exercise")
+
+    # Run reasons
+
+    async def add_reason(self, reason: str):
+        if reason not in self.run_reasons:
+            self.run_reasons.add(reason)
+            await self.reconcile()
+
+    async def remove_reason(self, reason: str):
+        if reason in self.run_reasons:
+            self.run_reasons.discard(reason)
+            await self.reconcile()
+
+    async def _on_engine_settled(self, settled: bool):
+        if settled:
+            await self.reconcile()
+
+    async def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        await self.reconcile()
+
+    async def reconcile(self):
+        """Start or stop the engine to match the active run reasons, respecting minimum run and rest times."""
+        if self._recheck_timer is not None:
+            self._recheck_timer.cancel()
+            self._recheck_timer = None
+
+        if not self.enabled:
+            return
+
+        state = self.engine.state
+        in_state_for = self.scheduler.clock() - self.engine.state_entered_at
+
+        if self.run_reasons and state == "stopped":
+            wait = self.min_rest_seconds - in_state_for
+            if wait > 0:
+                self._recheck_timer = self.scheduler.call_later(wait, self.reconcile)
+                return
+            log.info(f"Auto start: {', '.join(sorted(self.run_reasons))}")
+            await self.engine.start_request()
+
+        elif not self.run_reasons and state == "running":
+            wait = self.min_run_seconds - in_state_for
+            if wait > 0:
+                self._recheck_timer = self.scheduler.call_later(wait, self.reconcile)
+                return
+            log.info("Auto stop: no run reasons active")
+            await self.engine.stop_request()
+
+
+async def _call(func, *args):
+    result = func(*args)
+    if inspect.isawaitable(result):
+        await result
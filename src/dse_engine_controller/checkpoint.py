@@ -0,0 +1,54 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+class StateCheckpoint:
+    """
+    Small JSON checkpoint of controller state on local disk.
+
+    Writes go to a temporary file which is then renamed over the checkpoint,
+    so a crash mid-write leaves the previous checkpoint intact. Identical
+    consecutive writes are skipped. I/O errors are logged rather than raised;
+    losing a checkpoint must never stop the controller.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._last_written: str | None = None
+
+    def load(self) -> dict[str, Any] | None:
+        """Return the saved checkpoint, or None if there is no usable checkpoint."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+        if not isinstance(data, dict):
+            log.warning(f"Ignoring malformed checkpoint {self.path}")
+            return None
+        return data
+
+    def save(self, data: dict[str, Any]):
+        """Atomically replace the checkpoint with `data`."""
+        text = json.dumps(data, separators=(",", ":"))
+        if text == self._last_written:
+            return
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(text)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning(f"Failed to write checkpoint {self.path}: {e}")
+            return
+
+        self._last_written = text
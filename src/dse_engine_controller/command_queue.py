@@ -0,0 +1,177 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+log = logging.getLogger(__name__)
+
+# Lower runs first
+PRIORITIES = {
+    "emergency_stop": 0,
+    "reset_fault": 1,
+    "stop": 2,
+    "engine_mode": 2,
+    "start": 3,
+}
+
+# Pending commands made stale by a newer command. A start never cancels a
+# pending stop: the stop runs first and the start is then refused by state.
+SUPERSEDES = {
+    "emergency_stop": ("start", "stop", "reset_fault", "engine_mode"),
+    "stop": ("start",),
+}
+
+
+class Command:
+    __slots__ = ("name", "value", "priority", "enqueued_at", "cancelled")
+
+    def __init__(self, name: str, value: Any, priority: int, enqueued_at: float):
+        self.name = name
+        self.value = value
+        self.priority = priority
+        self.enqueued_at = enqueued_at
+        self.cancelled = False
+
+
+class CommandQueue:
+    """
+    Bounded priority queue of control commands with coalescing.
+
+    - Emergency stop always runs before anything else still pending.
+    - At most one command of each kind is pending; a repeat replaces the
+      pending command's value (latest wins) instead of queueing again.
+    - A command drops pending commands it supersedes (a stop cancels a
+      pending start, but not the other way round).
+
+    The queue is bounded by the number of command kinds (one per handler), so
+    it never fills up and no press is ever rejected.
+
+    Commands are executed one at a time by `run`, in priority then arrival order.
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Callable[[Any], Awaitable[Any]]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.handlers = handlers
+        self.clock = clock
+
+        self._heap: list[tuple[int, int, Command]] = []
+        self._pending: dict[str, Command] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+
+        # Enqueue to completion latency of recent commands, seconds
+        self.latencies: deque[float] = deque(maxlen=100)
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def maxsize(self) -> int:
+        """Most commands that can be pending at once: one of each kind."""
+        return len(self.handlers)
+
+    def submit(self, name: str, value: Any = None):
+        """Queue a command without waiting for it."""
+        if name not in self.handlers:
+            raise ValueError(f"Unknown command: {name}")
+
+        pending = self._pending.get(name)
+        if pending is not None:
+            log.debug(f"Coalescing {name} command")
+            pending.value = value
+            return
+
+        for stale in SUPERSEDES.get(name, ()):
+            self._cancel(stale)
+
+        priority = PRIORITIES.get(name, max(PRIORITIES.values()))
+        command = Command(name, value, priority, self.clock())
+        self._pending[name] = command
+        heapq.heappush(self._heap, (priority, next(self._counter), command))
+        self._wakeup.set()
+
+    def _cancel(self, name: str):
+        command = self._pending.pop(name, None)
+        if command is not None:
+            command.cancelled = True
+
+    def _pop(self) -> Command | None:
+        while self._heap:
+            _, _, command = heapq.heappop(self._heap)
+            if not command.cancelled:
+                del self._pending[command.name]
+                return command
+        return None
+
+    async def run(self):
+        """Execute queued commands forever."""
+        while True:
+            command = self._pop()
+            if command is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            try:
+                await self.handlers[command.name](command.value)
+            except Exception as e:
+                log.error(f"Error handling {command.name} command: {e}", exc_info=e)
+            self.latencies.append(self.clock() - command.enqueued_at)
+
+
+class AlertBatcher:
+    """
+    Sends UI alerts in the background, batching those raised close together.
+
+    Alerts raised within `interval` seconds of the first are combined into a
+    single message (repeats are counted, not duplicated), so a burst of
+    commands costs one send over a slow uplink rather than one per command.
+    Urgent alerts flush the batch immediately.
+    """
+
+    def __init__(self, send: Callable[[str], Awaitable[Any]], interval: float = 2.0, max_pending: int = 50):
+        self.send = send
+        self.interval = interval
+        self._messages: dict[str, int] = {}
+        self._max_pending = max_pending
+        self._wakeup = asyncio.Event()
+        self._flush = asyncio.Event()
+
+    def add(self, message: str, urgent: bool = False):
+        """Queue an alert without waiting for it to be sent."""
+        if message in self._messages:
+            self._messages[message] += 1
+        elif len(self._messages) < self._max_pending:
+            self._messages[message] = 1
+        else:
+            log.warning(f"Alert batch full, dropping: {message}")
+            return
+        self._wakeup.set()
+        if urgent:
+            self._flush.set()
+
+    async def run(self):
+        """Send batched alerts forever."""
+        while True:
+            await self._wakeup.wait()
+            try:
+                await asyncio.wait_for(self._flush.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            self._flush.clear()
+
+            messages, self._messages = self._messages, {}
+            if not messages:
+                continue
+            text = "\n".join(m if count == 1 else f"{m} (x{count})" for m, count in messages.items())
+            try:
+                await self.send(text)
+            except Exception as e:
+                log.error(f"Failed to send alert, operators were NOT notified of: {text!r}: {e}", exc_info=e)
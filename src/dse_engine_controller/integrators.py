@@ -0,0 +1,164 @@
+"""
+Incremental run-hour and fuel-burn accumulators.
+
+Each update is O(1) and touches only float attributes, so they can be fed
+every sample without allocating. State round-trips through plain dicts for
+the controller checkpoint.
+"""
+import math
+
+SECONDS_PER_HOUR = 3600
+
+
+class RunHoursIntegrator:
+    """
+    Accumulates engine running hours from sample times.
+
+    Time between two samples counts as running only if the engine was running
+    at both. Gaps longer than `max_gap_seconds` (e.g. the controller was down)
+    are not counted, since we cannot know what the engine did meanwhile.
+    """
+
+    __slots__ = ("hours", "max_gap_seconds", "_last_at", "_last_running")
+
+    def __init__(self, max_gap_seconds: float = 60):
+        self.hours = 0.0
+        self.max_gap_seconds = max_gap_seconds
+        self._last_at: float | None = None
+        self._last_running = False
+
+    def update(self, running: bool, at: float):
+        """Add a sample taken at monotonic time `at`."""
+        if running and self._last_running and self._last_at is not None:
+            elapsed = at - self._last_at
+            if 0 < elapsed <= self.max_gap_seconds:
+                self.hours += elapsed / SECONDS_PER_HOUR
+        self._last_at = at
+        self._last_running = running
+
+    def to_dict(self) -> dict:
+        return {"hours": self.hours}
+
+    def restore(self, data: dict | None):
+        if data:
+            self.hours = float(data.get("hours", 0.0))
+
+
+class FuelBurnEstimator:
+    """
+    Estimates fuel burn rate from fuel level samples while the engine runs.
+
+    Fits fuel level against engine running hours (not wall time, so time
+    with the engine stopped is not fitted as a flat stretch of zero burn)
+    with exponentially weighted least squares,
+    kept as running sums so each sample is O(1). Times are stored relative to
+    the newest sample (the sums are shifted on each update), which keeps them
+    small however long the estimator runs. Samples are down-weighted by how
+    far they fall from the current fit (Huber weighting against a running
+    mean absolute residual), so sender noise and sloshing do not swing the
+    estimate. A rise well above the fit is treated as a refill and restarts
+    the fit.
+
+    Fuel level is in percent; the burn rate is percent per running hour.
+    """
+
+    __slots__ = (
+        "half_life_hours", "refill_threshold", "huber_k",
+        "_sw", "_st", "_sy", "_stt", "_sty", "_last_hours", "_scale", "_count",
+    )
+
+    def __init__(self, half_life_hours: float = 0.5, refill_threshold: float = 5.0, huber_k: float = 2.0):
+        self.half_life_hours = half_life_hours
+        self.refill_threshold = refill_threshold
+        self.huber_k = huber_k
+        self.reset()
+
+    def reset(self):
+        self._sw = self._st = self._sy = self._stt = self._sty = 0.0
+        self._last_hours: float | None = None
+        self._scale = 0.0
+        self._count = 0
+
+    def update(self, level: float, run_hours: float):
+        """Add a fuel level sample (percent) taken when the engine had run for `run_hours`."""
+        dt = 0.0 if self._last_hours is None else run_hours - self._last_hours
+        if dt < 0:
+            return
+        if dt > 0:
+            # Move the time origin to this sample, then age the existing samples
+            self._stt -= 2 * dt * self._st - dt * dt * self._sw
+            self._sty -= dt * self._sy
+            self._st -= dt * self._sw
+            decay = 0.5 ** (dt / self.half_life_hours)
+            self._sw *= decay
+            self._st *= decay
+            self._sy *= decay
+            self._stt *= decay
+            self._sty *= decay
+
+        weight = 1.0
+        predicted = self.level
+        if predicted is not None:
+            residual = level - predicted
+            if residual > self.refill_threshold:
+                self.reset()
+            else:
+                if self._count >= 3 and self._scale > 0:
+                    limit = self.huber_k * self._scale
+                    if abs(residual) > limit:
+                        weight = limit / abs(residual)
+                self._scale += 0.1 * (abs(residual) - self._scale)
+
+        self._sw += weight
+        self._sy += weight * level
+        self._last_hours = run_hours
+        self._count += 1
+
+    @property
+    def level(self) -> float | None:
+        """Fitted fuel level at the latest sample."""
+        if self._sw <= 0:
+            return None
+        slope = self._slope()
+        return (self._sy - (slope or 0.0) * self._st) / self._sw
+
+    def _slope(self) -> float | None:
+        denominator = self._sw * self._stt - self._st * self._st
+        if self._count < 2 or denominator <= 1e-12:
+            return None
+        return (self._sw * self._sty - self._st * self._sy) / denominator
+
+    @property
+    def burn_rate(self) -> float | None:
+        """Fuel burn rate in percent per running hour, or None until there is enough data."""
+        slope = self._slope()
+        return None if slope is None else max(0.0, -slope)
+
+    @property
+    def hours_to_empty(self) -> float | None:
+        """Projected running hours until the tank is empty at the current burn rate."""
+        rate = self.burn_rate
+        level = self.level
+        if not rate or level is None or not math.isfinite(rate):
+            return None
+        return max(0.0, level) / rate
+
+    def to_dict(self) -> dict:
+        return {
+            "sums": [self._sw, self._st, self._sy, self._stt, self._sty],
+            "scale": self._scale,
+            "count": self._count,
+            "last_run_hours": self._last_hours,
+        }
+
+    def restore(self, data: dict | None):
+        if not data:
+            return
+        try:
+            self._sw, self._st, self._sy, self._stt, self._sty = (float(v) for v in data["sums"])
+            self._scale = float(data.get("scale", 0.0))
+            self._count = int(data.get("count", 0))
+            last = data.get("last_run_hours")
+            self._last_hours = None if last is None else float(last)
+        except (KeyError, TypeError, ValueError):
+            self.reset()
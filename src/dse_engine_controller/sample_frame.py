@@ -0,0 +1,98 @@
+import time
+from dataclasses import asdict, dataclass
+
+# RPM above which the engine is considered to be running
+RUNNING_RPM = 100
+
+# Engine parameters carried by each frame, in field order
+SAMPLE_FIELDS = ("rpm", "oil_pressure", "coolant_temp", "battery_voltage", "fuel_level", "engine_hours")
+
+
+@dataclass(frozen=True, slots=True)
+class SampleFrame:
+    """
+    One acquisition of engine parameters from the data source.
+
+    Parameters the source did not provide are None rather than a
+    plausible-looking default, so a missing source can never pass for a
+    healthy stopped engine.
+    """
+
+    sequence: int
+    timestamp: float | None  # source timestamp, epoch seconds
+    received_at: float  # local monotonic time the frame was first seen
+
+    rpm: float | None = None
+    oil_pressure: float | None = None
+    coolant_temp: float | None = None
+    battery_voltage: float | None = None
+    fuel_level: float | None = None
+    engine_hours: float | None = None
+
+    # Optional tracing stamps from the source
+    trace_id: str | None = None
+    source_monotonic: float | None = None
+
+    # Optional high-rate sample windows for analysis
+    rpm_samples: list[float] | None = None
+    oil_pressure_samples: list[float] | None = None
+    sample_rate_hz: float | None = None
+
+    @property
+    def engine_running(self) -> bool:
+        return self.rpm is not None and self.rpm > RUNNING_RPM
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# Frame used before anything has been received from the source
+EMPTY_FRAME = SampleFrame(sequence=-1, timestamp=None, received_at=0.0)
+
+
+class FrameTracker:
+    """
+    Tracks which frames have been processed and whether the source is advancing.
+
+    Sources that publish a sequence number are tracked by it. For sources that
+    don't, a new sequence is assigned whenever any value changes, so unchanged
+    readings are not processed twice. Steady readings (e.g. a stopped engine)
+    look the same as a frozen source then, so staleness is only reported for
+    sources that publish a sequence number.
+    """
+
+    def __init__(self, stale_after_seconds: float):
+        self.stale_after_seconds = stale_after_seconds
+        self.last_sequence: int | None = None
+        self.last_advanced_at = time.monotonic()
+
+        self.source_sequenced = False
+
+        self._derived_sequence = 0
+        self._last_values: tuple | None = None
+
+    def next_sequence(self, source_sequence: int | None, values: tuple) -> int:
+        """Sequence number for a frame with the given source sequence (if any) and values."""
+        self.source_sequenced = source_sequence is not None
+        if source_sequence is not None:
+            return source_sequence
+        if values != self._last_values:
+            self._last_values = values
+            self._derived_sequence += 1
+        return self._derived_sequence
+
+    def accept(self, frame: SampleFrame) -> bool:
+        """Return True if `frame` has not been processed before, marking it processed."""
+        if frame.sequence == self.last_sequence:
+            return False
+        self.last_sequence = frame.sequence
+        self.last_advanced_at = frame.received_at
+        return True
+
+    def is_stale(self, now: float | None = None) -> bool:
+        """Whether a sequenced source has not advanced within the staleness window."""
+        if not self.source_sequenced:
+            return False
+        if now is None:
+            now = time.monotonic()
+        return now - self.last_advanced_at > self.stale_after_seconds
@@ -0,0 +1,182 @@
+import logging
+from bisect import bisect_left
+from collections import deque
+
+from .sample_frame import RUNNING_RPM
+
+log = logging.getLogger(__name__)
+
+# States that make up a start attempt, from start request until the engine fires.
+START_SEQUENCE_STATES = ("pre_crank", "cranking", "crank_rest")
+
+
+class DurationHistogram:
+    """
+    Fixed-bucket histogram of durations in seconds.
+
+    Buckets are upper bounds; anything longer than the last bound is
+    counted in the overflow bucket.
+    """
+
+    bounds = (0.5, 1, 2, 3, 5, 10, 15, 30, 60, 120)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def record(self, seconds: float):
+        """Add a duration to the histogram."""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b}" for b in self.bounds] + ["overflow"]
+        return {
+            "count": self.count,
+            "mean": _round(self.mean),
+            "min": _round(self.min),
+            "max": _round(self.max),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class StartStatistics:
+    """
+    Start-sequence latency statistics for an engine.
+
+    Fed with every state transition and with RPM samples, this keeps:
+        - a duration histogram per transition, keyed "source->dest", measuring
+          how long the engine spent in the source state
+        - a summary of each recent start attempt (crank attempts, time to
+          running, RPM ramp rate)
+        - success / failure / abort counts and the resulting success rate
+
+    The RPM ramp rate is the RPM gained per second between the last sample at
+    or below the running threshold and the first sample above it, using the
+    samples' own times. It is only as fine as the samples fed in: with 1 Hz
+    samples an engine that reaches speed within a second reads as the RPM
+    gained over that second.
+
+    Aborted starts (emergency stop or stop request mid-sequence) are an operator
+    decision rather than a start failure, so they are excluded from the
+    success rate.
+    """
+
+    def __init__(self, history: int = 20):
+        self.histograms: dict[str, DurationHistogram] = {}
+        self.recent_starts: deque[dict] = deque(maxlen=history)
+
+        self.successes = 0
+        self.failures = 0
+        self.aborts = 0
+
+        self._start_at: float | None = None
+        self._crank_at: float | None = None
+        self._attempts = 0
+        self._below_threshold: tuple[float, float] | None = None
+        self._ramp_rate: float | None = None
+
+    def record_rpm(self, rpm: float, at: float):
+        """Add an RPM sample taken at monotonic time `at`, used for the ramp rate of a start in progress."""
+        if self._crank_at is None or self._ramp_rate is not None or at < self._crank_at:
+            return
+        if rpm <= RUNNING_RPM:
+            self._below_threshold = (rpm, at)
+        elif self._below_threshold is not None:
+            last_rpm, last_at = self._below_threshold
+            if at > last_at:
+                self._ramp_rate = (rpm - last_rpm) / (at - last_at)
+
+    def record_transition(self, source: str, dest: str, entered_source_at: float, now: float):
+        """
+        Record a transition from `source` to `dest`.
+
+        Args:
+            source: State being left
+            dest: State being entered
+            entered_source_at: Monotonic time the source state was entered
+            now: Monotonic time of this transition
+        """
+        if source != dest:
+            key = f"{source}->{dest}"
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = DurationHistogram()
+            histogram.record(now - entered_source_at)
+
+        if dest == "pre_crank":
+            self._reset_start()
+            self._start_at = now
+        elif self._start_at is None:
+            return
+        elif dest == "cranking":
+            self._attempts += 1
+            self._crank_at = now
+            self._below_threshold = None
+        elif dest == "running":
+            self._finish_start("success", now)
+        elif dest == "fault":
+            self._finish_start("failed", now)
+        elif dest not in START_SEQUENCE_STATES:
+            self._finish_start("aborted", now)
+
+    def _reset_start(self):
+        self._start_at = None
+        self._crank_at = None
+        self._attempts = 0
+        self._below_threshold = None
+        self._ramp_rate = None
+
+    def _finish_start(self, outcome: str, now: float):
+        summary = {
+            "outcome": outcome,
+            "attempts": self._attempts,
+            "time_to_running": None,
+            "rpm_ramp_rate": None,
+        }
+
+        if outcome == "success":
+            self.successes += 1
+            summary["time_to_running"] = _round(now - self._start_at)
+            summary["rpm_ramp_rate"] = _round(self._ramp_rate)
+        elif outcome == "failed":
+            self.failures += 1
+        else:
+            self.aborts += 1
+
+        log.info(f"Start attempt finished: {summary}")
+        self.recent_starts.append(summary)
+        self._reset_start()
+
+    @property
+    def success_rate(self) -> float | None:
+        completed = self.successes + self.failures
+        return self.successes / completed if completed else None
+
+    def to_dict(self) -> dict:
+        """Summary suitable for publishing as a tag."""
+        times = [s["time_to_running"] for s in self.recent_starts if s["time_to_running"] is not None]
+        return {
+            "successes": self.successes,
+            "failures": self.failures,
+            "aborts": self.aborts,
+            "success_rate": _round(self.success_rate),
+            "mean_time_to_running": _round(sum(times) / len(times)) if times else None,
+            "last_start": self.recent_starts[-1] if self.recent_starts else None,
+            "recent_starts": list(self.recent_starts),
+            "transitions": {key: h.to_dict() for key, h in self.histograms.items()},
+        }
+
+
+def _round(value: float | None, digits: int = 3) -> float | None:
+    return None if value is None else round(value, digits)
@@ -0,0 +1,127 @@
+import json
+import logging
+import math
+import time
+from collections import deque
+from pathlib import Path
+
+from .sample_frame import SampleFrame
+
+log = logging.getLogger(__name__)
+
+# Pipeline stages a sample passes through, in order. UI changes are staged in
+# memory during the loop and only sent when pydoover pushes the UI at the start
+# of the next loop, after the frame has been published.
+STAGES = ("source", "acquired", "alarms", "state", "ui_staged", "published", "ui_sent")
+
+# Percentiles reported for each hop
+PERCENTILES = (50, 90, 99)
+
+
+class Trace:
+    """Monotonic timestamps for one sample frame as it moves through the pipeline."""
+
+    __slots__ = ("trace_id", "marks")
+
+    def __init__(self, trace_id: str | None):
+        self.trace_id = trace_id
+        self.marks: dict[str, float] = {}
+
+    def mark(self, stage: str, at: float | None = None):
+        self.marks[stage] = time.monotonic() if at is None else at
+
+
+class _NullTrace:
+    """Stand-in used when tracing is disabled, so call sites need no checks."""
+
+    __slots__ = ()
+    trace_id = None
+
+    def mark(self, stage: str, at: float | None = None):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class LatencyTracer:
+    """
+    Per-hop latency aggregation for traced sample frames.
+
+    Each finished trace contributes the time between consecutive stages
+    (e.g. ``acquired->alarms``) and the end-to-end time from the first to the
+    last recorded stage. The most recent `window` samples of each hop are
+    kept and summarised as percentiles in milliseconds.
+
+    The source stage uses the monotonic timestamp stamped by the data source,
+    which is only comparable when the source runs on the same host.
+    """
+
+    export_interval = 15
+
+    def __init__(self, enabled: bool = False, window: int = 1000, report_path: str | Path | None = None):
+        self.enabled = enabled
+        self.window = window
+        self.report_path = Path(report_path) if report_path else None
+
+        self.hops: dict[str, deque[float]] = {}
+        self.last_exported_at = time.monotonic()
+
+    def begin(self, frame: SampleFrame) -> Trace | _NullTrace:
+        """Start a trace for `frame`, seeded with its source and acquisition times."""
+        if not self.enabled:
+            return NULL_TRACE
+
+        trace = Trace(frame.trace_id)
+        if frame.source_monotonic is not None:
+            trace.mark("source", frame.source_monotonic)
+        trace.mark("acquired", frame.received_at)
+        return trace
+
+    def finish(self, trace: Trace | _NullTrace):
+        """Record the hop latencies of a completed trace."""
+        if not isinstance(trace, Trace):
+            return
+
+        stages = [(s, trace.marks[s]) for s in STAGES if s in trace.marks]
+        for (prev, prev_at), (stage, at) in zip(stages, stages[1:]):
+            self._record(f"{prev}->{stage}", at - prev_at)
+        if len(stages) > 1:
+            self._record("end_to_end", stages[-1][1] - stages[0][1])
+
+    def _record(self, hop: str, seconds: float):
+        samples = self.hops.get(hop)
+        if samples is None:
+            samples = self.hops[hop] = deque(maxlen=self.window)
+        samples.append(seconds * 1000)
+
+    def summary(self) -> dict[str, dict]:
+        """Percentiles (ms) for each hop."""
+        result = {}
+        for hop, samples in self.hops.items():
+            ordered = sorted(samples)
+            stats = {f"p{p}": round(_percentile(ordered, p), 3) for p in PERCENTILES}
+            stats["max"] = round(ordered[-1], 3)
+            stats["count"] = len(ordered)
+            result[hop] = stats
+        return result
+
+    def export_due(self) -> bool:
+        return self.enabled and time.monotonic() - self.last_exported_at >= self.export_interval
+
+    def export(self) -> dict[str, dict]:
+        """Summarise the hop latencies, writing them to the report file if one is configured."""
+        self.last_exported_at = time.monotonic()
+        summary = self.summary()
+        if self.report_path is not None:
+            try:
+                self.report_path.write_text(json.dumps(summary, indent=2))
+            except OSError as e:
+                log.warning(f"Failed to write latency report {self.report_path}: {e}")
+        return summary
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,63 @@
+"""
+Test-mode application wired to an in-memory device agent.
+
+Tag writes and channel publishes are recorded instead of going over gRPC,
+and tags from the simulator app can be set directly, so tests can drive
+`setup()` and `main_loop()` without a device agent running. Channels given to
+the fake agent are delivered through pydoover's own subscription path, so
+`run_app` can be driven end to end as well.
+"""
+import copy
+
+from pydoover import config
+from pydoover.docker.device_agent import DeviceAgentInterface
+
+from dse_engine_controller.app_config import DseEngineControllerConfig
+from dse_engine_controller.application import DseEngineControllerApplication
+
+APP_KEY = "engine_controller"
+SIMULATOR_KEY = "engine_simulator"
+
+
+class FakeDeviceAgent(DeviceAgentInterface):
+    def __init__(self, channels: dict[str, object] | None = None):
+        super().__init__(APP_KEY, "", True)
+        self.channels = channels or {}
+        self.published: list[tuple[str, object]] = []
+
+    async def start_subscription_listener(self, channel_name):
+        # A responsive agent: the current aggregate arrives as soon as the subscription starts
+        if channel_name in self.channels:
+            await self.recv_update_callback(channel_name, None)
+
+    async def get_channel_aggregate_async(self, channel_name):
+        return copy.deepcopy(self.channels.get(channel_name))
+
+    async def publish_to_channel_async(self, channel_name, message, record_log=True, max_age=None):
+        self.published.append((channel_name, message))
+        return True
+
+
+def make_app(checkpoint_path, **values) -> DseEngineControllerApplication:
+    # pydoover keeps config elements in a map shared by every Schema instance, so building
+    # another schema fails unless the map is empty; clear it before and after ours
+    config.Schema._Schema__element_map.clear()
+    schema = DseEngineControllerConfig()
+    schema._inject_deployment_config({"simulator_app_key": SIMULATOR_KEY})
+    config.Schema._Schema__element_map.clear()
+    for name, value in {"checkpoint_path": str(checkpoint_path), **values}.items():
+        getattr(schema, name).value = value
+    return DseEngineControllerApplication(
+        config=schema, app_key=APP_KEY, device_agent=FakeDeviceAgent(), test_mode=True
+    )
+
+
+def set_source(app: DseEngineControllerApplication, **tags):
+    """Update the simulator app's tags as seen by the controller."""
+    app._tag_values.setdefault(SIMULATOR_KEY, {}).update(tags)
+
+
+async def stop(app: DseEngineControllerApplication):
+    for task in app._background_tasks:
+        task.cancel()
+    app.analyser.shutdown()
@@ -0,0 +1,93 @@
+import cmath
+import math
+import random
+import time
+
+from dse_engine_controller.analysis import EngineAnalyser, _fft, analyse_window, score_health
+
+SAMPLE_RATE_HZ = 50
+WINDOW = 256
+
+
+def dft(values):
+    n = len(values)
+    return [sum(x * cmath.exp(-2j * math.pi * k * i / n) for i, x in enumerate(values)) for k in range(n)]
+
+
+def rpm_window(rpm=1500.0, noise=2.0, fault=None, seed=0):
+    rng = random.Random(seed)
+    samples = []
+    for i in range(WINDOW):
+        t = i / SAMPLE_RATE_HZ
+        value = rpm + rng.gauss(0, noise)
+        if fault == "hunting":
+            value += 40 * math.sin(2 * math.pi * 1.0 * t)
+        elif fault == "misfire":
+            # One cylinder dropping out once per engine cycle (two revolutions)
+            value -= 30 * max(0.0, math.cos(2 * math.pi * rpm / 120 * t)) ** 8
+        samples.append(value)
+    return samples
+
+
+def test_fft_matches_dft():
+    rng = random.Random(1)
+    for n in (1, 2, 8, 64):
+        values = [complex(rng.uniform(-1, 1), rng.uniform(-1, 1)) for _ in range(n)]
+        for got, expected in zip(_fft(values), dft(values)):
+            assert abs(got - expected) < 1e-9
+
+
+def test_steady_engine_is_healthy():
+    result = analyse_window(rpm_window(), [40.0] * WINDOW, SAMPLE_RATE_HZ)
+    assert result["hunting_amplitude_rpm"] < 5
+    assert result["misfire_ratio"] < 0.3
+    assert result["oil_pressure_std_psi"] == 0
+
+
+def test_detects_hunting():
+    result = analyse_window(rpm_window(fault="hunting"), [], SAMPLE_RATE_HZ)
+    assert 30 < result["hunting_amplitude_rpm"] < 50
+    assert abs(result["hunting_frequency_hz"] - 1.0) <= SAMPLE_RATE_HZ / WINDOW
+    assert result["oil_pressure_std_psi"] is None
+
+
+def test_detects_misfire():
+    steady = analyse_window(rpm_window(), [], SAMPLE_RATE_HZ)
+    misfire = analyse_window(rpm_window(fault="misfire"), [], SAMPLE_RATE_HZ)
+    assert misfire["misfire_ratio"] > 0.3
+    assert misfire["misfire_ratio"] > 3 * steady["misfire_ratio"]
+    # Not mistaken for hunting
+    assert misfire["hunting_amplitude_rpm"] < 5
+
+
+def test_misfire_unknown_when_sample_rate_too_low():
+    # 1500 RPM is a 12.5 Hz cycle, above the Nyquist frequency of 10 Hz samples
+    assert analyse_window(rpm_window(), [], 10)["misfire_ratio"] is None
+
+
+def test_score_health():
+    thresholds = {"hunting_amplitude_rpm": 25, "misfire_ratio": 0.3, "oil_pressure_std_psi": 0}
+    scores, alarms = score_health(
+        {"hunting_amplitude_rpm": 30, "misfire_ratio": 0.15, "oil_pressure_std_psi": None}, thresholds
+    )
+    assert scores == {"hunting_amplitude_rpm": 0, "misfire_ratio": 50}
+    assert alarms == ["hunting_amplitude_rpm"]
+
+
+def test_analyser_runs_in_spawned_worker():
+    analyser = EngineAnalyser(window_size=WINDOW)
+    try:
+        analyser.add_samples(rpm_window(fault="hunting"), None, SAMPLE_RATE_HZ)
+        assert analyser.poll() is None
+
+        deadline = time.monotonic() + 30
+        result = None
+        while result is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+            result = analyser.poll()
+
+        assert result is not None and result["hunting_amplitude_rpm"] > 30
+        assert analyser._executor._mp_context.get_start_method() == "spawn"
+    finally:
+        analyser.shutdown()
+    assert analyser._executor is None
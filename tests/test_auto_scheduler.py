@@ -0,0 +1,308 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from dse_engine_controller.auto_scheduler import AutoScheduler, AutoStartController
+
+from .app_harness import make_app, stop
+
+
+LONDON = ZoneInfo("Europe/London")
+
+
+class FakeClock:
+    """Monotonic clock with a matching wall clock, starting at noon on the Tuesday before the 2026 UK DST change."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.started = datetime(2026, 3, 24, 12, 0, tzinfo=LONDON)
+
+    def __call__(self):
+        return self.now
+
+    def wall(self):
+        return (self.started + timedelta(seconds=self.now - 1000.0)).astimezone(LONDON)
+
+
+class FakeEngine:
+    """Stand-in for EngineState that settles immediately and records requests."""
+
+    def __init__(self, clock, state="stopped"):
+        self.clock = clock
+        self.state = state
+        self.state_entered_at = clock()
+        self.requests = []
+
+    def set_state(self, state):
+        self.state = state
+        self.state_entered_at = self.clock()
+
+    async def start_request(self):
+        self.requests.append("start")
+        self.set_state("running")
+
+    async def stop_request(self):
+        self.requests.append("stop")
+        self.set_state("stopped")
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.mark.asyncio
+async def test_timers_run_in_due_order(clock):
+    scheduler = AutoScheduler(clock=clock)
+    fired = []
+    scheduler.call_later(30, lambda: fired.append("c"))
+    scheduler.call_later(10, lambda: fired.append("a"))
+    scheduler.call_later(20, lambda: fired.append("b"))
+    cancelled = scheduler.call_later(15, lambda: fired.append("cancelled"))
+    cancelled.cancel()
+
+    await scheduler.run_due()
+    assert fired == []
+
+    clock.now += 25
+    await scheduler.run_due()
+    assert fired == ["a", "b"]
+    assert scheduler.next_due == clock.now + 5
+
+    clock.now += 5
+    await scheduler.run_due()
+    assert fired == ["a", "b", "c"]
+    assert scheduler.next_due is None
+
+
+@pytest.mark.asyncio
+async def test_conditions_are_edge_triggered(clock):
+    scheduler = AutoScheduler(clock=clock)
+    changes = []
+    evaluated = []
+
+    def below(v):
+        evaluated.append(v)
+        return v < 12
+
+    scheduler.add_condition("battery_voltage", below, changes.append)
+
+    for voltage in (12.5, 12.5, 11.8, 11.5, 11.5, 12.6):
+        await scheduler.update_input("battery_voltage", voltage)
+
+    # Unchanged values are not re-evaluated, and on_change only fires on a flip
+    assert evaluated == [12.5, 11.8, 11.5, 12.6]
+    assert changes == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_condition_inactive_until_all_inputs_known(clock):
+    scheduler = AutoScheduler(clock=clock)
+    changes = []
+    scheduler.add_condition(("a", "b"), lambda a, b: a and b, changes.append)
+
+    await scheduler.update_input("a", True)
+    assert changes == []
+    await scheduler.update_input("b", True)
+    assert changes == [True]
+
+
+@pytest.mark.asyncio
+async def test_min_rest_defers_start(clock):
+    scheduler = AutoScheduler(clock=clock)
+    engine = FakeEngine(clock)
+    auto = AutoStartController(engine, scheduler, min_rest_seconds=300)
+    auto.add_load_demand()
+    await auto.set_enabled(True)
+
+    clock.now += 60
+    await scheduler.update_input("load_demand", True)
+    assert engine.requests == []
+
+    clock.now += 239
+    await scheduler.run_due()
+    assert engine.requests == []
+
+    clock.now += 1
+    await scheduler.run_due()
+    assert engine.requests == ["start"]
+
+
+@pytest.mark.asyncio
+async def test_min_run_defers_stop(clock):
+    scheduler = AutoScheduler(clock=clock)
+    engine = FakeEngine(clock)
+    auto = AutoStartController(engine, scheduler, min_run_seconds=600)
+    auto.add_load_demand()
+    await auto.set_enabled(True)
+
+    await scheduler.update_input("load_demand", True)
+    assert engine.requests == ["start"]
+
+    clock.now += 120
+    await scheduler.update_input("load_demand", False)
+    assert engine.requests == ["start"]
+
+    clock.now += 479
+    await scheduler.run_due()
+    assert engine.requests == ["start"]
+
+    clock.now += 1
+    await scheduler.run_due()
+    assert engine.requests == ["start", "stop"]
+
+
+@pytest.mark.asyncio
+async def test_demand_returning_cancels_deferred_stop(clock):
+    scheduler = AutoScheduler(clock=clock)
+    engine = FakeEngine(clock)
+    auto = AutoStartController(engine, scheduler, min_run_seconds=600)
+    auto.add_load_demand()
+    await auto.set_enabled(True)
+
+    await scheduler.update_input("load_demand", True)
+    await scheduler.update_input("load_demand", False)
+    await scheduler.update_input("load_demand", True)
+
+    clock.now += 600
+    await scheduler.run_due()
+    assert engine.requests == ["start"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_controller_does_not_act(clock):
+    scheduler = AutoScheduler(clock=clock)
+    engine = FakeEngine(clock)
+    auto = AutoStartController(engine, scheduler)
+    auto.add_load_demand()
+
+    await scheduler.update_input("load_demand", True)
+    assert engine.requests == []
+    assert auto.run_reasons == {"load_demand"}
+
+    await auto.set_enabled(True)
+    assert engine.requests == ["start"]
+
+
+@pytest.mark.asyncio
+async def test_battery_charge_run(clock):
+    scheduler = AutoScheduler(clock=clock)
+    engine = FakeEngine(clock)
+    auto = AutoStartController(engine, scheduler)
+    auto.add_battery_charge_run(voltage_threshold=12.0, duration_seconds=1800)
+    await auto.set_enabled(True)
+
+    await scheduler.update_input("battery_voltage", 12.4)
+    assert engine.requests == []
+
+    await scheduler.update_input("battery_voltage", 11.7)
+    assert engine.requests == ["start"]
+
+    clock.now += 1800
+    await scheduler.run_due()
+    assert engine.requests == ["start", "stop"]
+
+
+def make_exercise(clock, engine=None):
+    scheduler = AutoScheduler(clock=clock, wall_clock=clock.wall)
+    engine = engine or FakeEngine(clock)
+    auto = AutoStartController(engine, scheduler, tz=LONDON)
+    auto.add_exercise_schedule(interval_days=7, start_hour=10, duration_seconds=1800)
+    return scheduler, engine, auto
+
+
+@pytest.mark.asyncio
+async def test_exercise_run_reschedules_on_calendar(clock):
+    scheduler, engine, auto = make_exercise(clock)
+    await auto.set_enabled(True)
+
+    # Never exercised: the next 10:00
+    first = scheduler.next_due
+    assert first - clock.now == 22 * 3600
+
+    clock.now = first
+    await scheduler.run_due()
+    assert engine.requests == ["start"]
+    assert auto.last_exercise_at == datetime(2026, 3, 25, 10, tzinfo=LONDON)
+
+    clock.now += 1800
+    await scheduler.run_due()
+    assert engine.requests == ["start", "stop"]
+    # A week later at 10:00 local time, which is an hour less than 7 * 24h across the DST change
+    assert auto.next_exercise_at() == datetime(2026, 4, 1, 10, tzinfo=LONDON)
+    assert scheduler.next_due == first + 7 * 86400 - 3600
+
+
+@pytest.mark.asyncio
+async def test_restart_does_not_bring_exercise_forward(clock):
+    _, _, auto = make_exercise(clock)
+    auto.last_exercise_at = datetime(2026, 3, 22, 10, tzinfo=LONDON)
+    saved = json.loads(json.dumps(auto.to_dict()))
+
+    # Daily watchdog restarts: each one schedules from the saved run, not the next 10:00
+    for _ in range(3):
+        scheduler, engine, auto = make_exercise(clock)
+        await auto.restore(saved)
+        await auto.set_enabled(True)
+        assert auto.next_exercise_at() == datetime(2026, 3, 29, 10, tzinfo=LONDON)
+        assert scheduler.next_due == clock.now + auto.next_exercise_at().timestamp() - clock.wall().timestamp()
+        assert engine.requests == []
+        clock.now += 86400
+
+
+@pytest.mark.asyncio
+async def test_missed_exercise_runs_at_next_start_hour(clock):
+    _, _, auto = make_exercise(clock)
+    await auto.restore({"last_exercise_at": "2026-03-10T10:00:00+00:00"})
+    assert auto.next_exercise_at() == datetime(2026, 3, 25, 10, tzinfo=LONDON)
+
+
+@pytest.mark.asyncio
+async def test_restart_mid_exercise_resumes_it(clock):
+    scheduler, engine, auto = make_exercise(clock)
+    await auto.restore({"last_exercise_at": (clock.wall() - timedelta(minutes=10)).isoformat()})
+    await auto.set_enabled(True)
+    assert engine.requests == ["start"]
+    assert auto.next_exercise_at() == datetime(2026, 3, 31, 10, tzinfo=LONDON)
+
+    # Only the remaining 20 minutes are run
+    clock.now += 20 * 60
+    await scheduler.run_due()
+    assert engine.requests == ["start", "stop"]
+
+
+@pytest.mark.asyncio
+async def test_restore_ignores_bad_exercise_time(clock):
+    _, _, auto = make_exercise(clock)
+    for data in (None, {}, {"last_exercise_at": "yesterday"}, {"last_exercise_at": "2026-03-22T10:00:00"}):
+        await auto.restore(data)
+        assert auto.last_exercise_at is None
+
+
+@pytest.mark.asyncio
+async def test_operator_stop_leaves_auto_mode(tmp_path):
+    app = make_app(tmp_path / "state.json", auto_start_enabled=True, min_rest_minutes=0)
+    await app.setup()
+    await app.state.restore("running")
+    app.engine_mode = "auto"
+    await app._update_auto_start_enabled()
+    await app.auto_start.add_reason("load_demand")
+
+    await app.on_stop_engine(True)
+    while not app.commands.latencies:
+        await asyncio.sleep(0)
+
+    assert app.state.state == "cooling_down"
+    assert app.engine_mode == "manual"
+    assert app.ui.engine_mode.current_value == "manual"
+    assert not app.auto_start.enabled
+
+    # Cooldown finishes with the load demand still there: the engine stays stopped
+    await app.state.shutdown_complete()
+    await app.auto_scheduler.update_input(app.auto_start.input_name("engine_state"), app.state.state)
+    await app.auto_scheduler.run_due()
+    assert app.state.state == "stopped"
+    await stop(app)
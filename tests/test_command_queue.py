@@ -0,0 +1,197 @@
+"""
+Stress tests for the UI command queue.
+
+A burst of commands from several dashboard users must not pile up behind the
+state machine: the queue stays bounded, emergency stop jumps ahead, and a
+press waits behind a bounded number of other commands.
+"""
+import asyncio
+import random
+
+import pytest
+
+from dse_engine_controller.command_queue import PRIORITIES, AlertBatcher, CommandQueue
+
+from .app_harness import make_app, stop
+
+# Simulated time for the state machine to handle one command
+HANDLER_SECONDS = 0.005
+
+
+def make_queue():
+    handled = []
+
+    def handler(name):
+        async def handle(value):
+            await asyncio.sleep(HANDLER_SECONDS)
+            handled.append((name, value))
+        return handle
+
+    names = ("start", "stop", "emergency_stop", "reset_fault", "engine_mode")
+    queue = CommandQueue({name: handler(name) for name in names})
+    return queue, handled
+
+
+class HandledCount:
+    """Queue clock that advances once per handled command, so latency is counted in commands."""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_burst_against_state_machine(tmp_path):
+    app = make_app(tmp_path / "state.json")
+    await app.setup()
+
+    clock = HandledCount()
+    handled = []
+
+    def counted(name, handler):
+        async def handle(value):
+            await handler(value)
+            handled.append(name)
+            clock.now += 1
+        return handle
+
+    app.commands.clock = clock
+    app.commands.handlers = {name: counted(name, handler) for name, handler in app.commands.handlers.items()}
+
+    rng = random.Random(0)
+    presses = (
+        lambda: app.on_start_engine(True),
+        lambda: app.on_stop_engine(True),
+        lambda: app.on_reset_fault(True),
+        lambda: app.on_engine_mode_change(rng.choice(("manual", "auto"))),
+    )
+    for _ in range(20):
+        # Several users mashing buttons at once, with the runner getting a few turns in between
+        for _ in range(50):
+            await rng.choice(presses)()
+            assert len(app.commands) <= app.commands.maxsize
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    while len(app.commands):
+        await asyncio.sleep(0)
+
+    # 1000 presses collapse to a handful of state machine calls
+    assert len(handled) < 200
+    assert app.state.state == "pre_crank"
+    # At most one command of each kind is pending, so nothing waits behind more than that
+    assert max(app.commands.latencies) <= len(PRIORITIES)
+
+    await app.on_emergency_stop(True)
+    while "emergency_stop" not in handled:
+        await asyncio.sleep(0)
+    assert app.state.state == "stopped"
+    await stop(app)
+
+
+@pytest.mark.asyncio
+async def test_start_does_not_cancel_stop(tmp_path):
+    app = make_app(tmp_path / "state.json")
+    await app.setup()
+    await app.state.restore("running")
+
+    # Two operators: one presses stop, the other start, before the runner gets a turn
+    await app.on_stop_engine(True)
+    await app.on_start_engine(True)
+    assert len(app.commands) == 2
+    while len(app.commands.latencies) < 2:
+        await asyncio.sleep(0)
+
+    # The stop went through; the start was then refused since the engine is not stopped
+    assert app.state.state == "cooling_down"
+    assert "Engine stop sequence initiated" in app.alerts._messages
+    assert "Engine start sequence initiated" not in app.alerts._messages
+    await stop(app)
+
+
+@pytest.mark.asyncio
+async def test_emergency_stop_jumps_queue():
+    queue, handled = make_queue()
+    queue.submit("engine_mode", "auto")
+    queue.submit("start")
+    queue.submit("reset_fault")
+    queue.submit("emergency_stop")
+
+    runner = asyncio.create_task(queue.run())
+    while len(queue):
+        await asyncio.sleep(HANDLER_SECONDS)
+    await asyncio.sleep(HANDLER_SECONDS * 2)
+    runner.cancel()
+
+    # Emergency stop runs first and drops the commands it makes stale
+    assert handled == [("emergency_stop", None)]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_and_supersede():
+    queue, handled = make_queue()
+    for value in ("auto", "manual", "off"):
+        queue.submit("engine_mode", value)
+    queue.submit("start")
+    queue.submit("stop")
+    assert len(queue) == 2
+
+    runner = asyncio.create_task(queue.run())
+    while len(queue):
+        await asyncio.sleep(HANDLER_SECONDS)
+    await asyncio.sleep(HANDLER_SECONDS * 2)
+    runner.cancel()
+
+    assert handled == [("engine_mode", "off"), ("stop", None)]
+
+
+@pytest.mark.asyncio
+async def test_bounded_by_command_kinds():
+    queue, handled = make_queue()
+    rng = random.Random(0)
+    for _ in range(1000):
+        queue.submit(rng.choice(list(PRIORITIES)), "auto")
+        assert len(queue) <= queue.maxsize == len(PRIORITIES)
+
+    # Every kind pending at once fills the queue; nothing is rejected or evicted
+    queue, handled = make_queue()
+    queue.submit("stop")
+    queue.submit("start")
+    queue.submit("engine_mode", "auto")
+    queue.submit("reset_fault")
+    queue.submit("emergency_stop")
+    queue.submit("stop")
+    queue.submit("start")
+    queue.submit("engine_mode", "auto")
+    queue.submit("reset_fault")
+    assert len(queue) == queue.maxsize
+
+    runner = asyncio.create_task(queue.run())
+    while len(queue):
+        await asyncio.sleep(HANDLER_SECONDS)
+    await asyncio.sleep(HANDLER_SECONDS * 2)
+    runner.cancel()
+
+    assert handled == [
+        ("emergency_stop", None), ("reset_fault", None), ("stop", None), ("engine_mode", "auto"), ("start", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_alerts_batched():
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    batcher = AlertBatcher(send, interval=0.05)
+    runner = asyncio.create_task(batcher.run())
+    for _ in range(100):
+        batcher.add("Engine start sequence initiated")
+    batcher.add("Engine stop sequence initiated")
+    await asyncio.sleep(0.1)
+    runner.cancel()
+
+    assert sent == ["Engine start sequence initiated (x100)\nEngine stop sequence initiated"]
@@ -20,4 +20,28 @@ def test_ui():
 
 def test_state():
     from dse_engine_controller.app_state import DseEngineControllerState
-    assert DseEngineControllerState
\ No newline at end of file
+    assert DseEngineControllerState
+
+def test_start_stats():
+    from dse_engine_controller.start_stats import StartStatistics
+    assert StartStatistics
+
+def test_auto_scheduler():
+    from dse_engine_controller.auto_scheduler import AutoScheduler, AutoStartController
+    assert AutoScheduler and AutoStartController
+
+def test_sample_frame():
+    from dse_engine_controller.sample_frame import SampleFrame, FrameTracker
+    assert SampleFrame and FrameTracker
+
+def test_tracing():
+    from dse_engine_controller.tracing import LatencyTracer
+    assert LatencyTracer
+
+def test_analysis():
+    from dse_engine_controller.analysis import EngineAnalyser, analyse_window
+    assert EngineAnalyser and analyse_window
+
+def test_integrators():
+    from dse_engine_controller.integrators import FuelBurnEstimator, RunHoursIntegrator
+    assert FuelBurnEstimator and RunHoursIntegrator
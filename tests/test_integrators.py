@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from dse_engine_controller.integrators import FuelBurnEstimator, RunHoursIntegrator
+
+# One sample a second
+STEP_HOURS = 1 / 3600
+
+
+def burn(estimator, start_level, rate, hours, start_hours=0.0, noise=0.0, seed=0):
+    """Feed samples of a tank burning at `rate` percent per running hour; returns the final running hours."""
+    rng = random.Random(seed)
+    steps = round(hours / STEP_HOURS)
+    for i in range(steps + 1):
+        t = i * STEP_HOURS
+        estimator.update(start_level - rate * t + rng.gauss(0, noise), start_hours + t)
+    return start_hours + hours
+
+
+def test_run_hours_counts_only_running_time():
+    hours = RunHoursIntegrator()
+    hours.update(True, 0)
+    hours.update(True, 30)
+    hours.update(False, 60)  # stopped somewhere in between: not counted
+    hours.update(False, 600)
+    hours.update(True, 660)
+    hours.update(True, 720)
+    assert hours.hours == pytest.approx(90 / 3600)
+
+
+def test_run_hours_skips_long_gaps():
+    hours = RunHoursIntegrator(max_gap_seconds=60)
+    hours.update(True, 0)
+    hours.update(True, 60)
+    # Controller down for ten minutes: what the engine did meanwhile is unknown
+    hours.update(True, 660)
+    hours.update(True, 661)
+    assert hours.hours == pytest.approx(61 / 3600)
+
+
+def test_run_hours_restore():
+    hours = RunHoursIntegrator()
+    hours.restore({"hours": 12.5})
+    hours.update(True, 1000)
+    hours.update(True, 1036)
+    assert hours.hours == pytest.approx(12.51)
+    assert RunHoursIntegrator().to_dict() == {"hours": 0.0}
+
+
+def test_linear_burn():
+    estimator = FuelBurnEstimator()
+    assert estimator.burn_rate is None
+    burn(estimator, 80, 5, 1.0)
+
+    assert estimator.burn_rate == pytest.approx(5, rel=1e-3)
+    assert estimator.level == pytest.approx(75, abs=0.01)
+    assert estimator.hours_to_empty == pytest.approx(15, rel=1e-3)
+
+
+def test_noisy_sender():
+    estimator = FuelBurnEstimator()
+    burn(estimator, 80, 5, 2.0, noise=1.0)
+    assert estimator.burn_rate == pytest.approx(5, rel=0.1)
+
+
+def test_slosh_spikes_are_down_weighted():
+    clean, spiky = FuelBurnEstimator(), FuelBurnEstimator()
+    burn(clean, 80, 5, 1.0, noise=0.2)
+    rng = random.Random(0)
+    for i in range(3601):
+        t = i * STEP_HOURS
+        level = 80 - 5 * t + rng.gauss(0, 0.2)
+        if i % 50 == 0:
+            level -= 4  # brief slosh reading low
+        spiky.update(level, t)
+    assert spiky.burn_rate == pytest.approx(clean.burn_rate, rel=0.05)
+
+
+def test_refill_restarts_fit():
+    estimator = FuelBurnEstimator()
+    hours = burn(estimator, 40, 5, 1.0)
+    # Topped up to 90% between runs
+    burn(estimator, 90, 5, 0.25, start_hours=hours)
+    assert estimator.level == pytest.approx(88.75, abs=0.01)
+    assert estimator.burn_rate == pytest.approx(5, rel=1e-2)
+
+
+def test_stopped_time_is_not_fitted():
+    # 1 h running, 30 min stopped, 10 min running: fitted against running hours the stop is invisible
+    estimator = FuelBurnEstimator()
+    hours = burn(estimator, 80, 5, 1.0)
+    burn(estimator, 75, 5, 10 / 60, start_hours=hours)
+    assert estimator.burn_rate == pytest.approx(5, rel=1e-3)
+
+
+def test_restore_round_trip():
+    uninterrupted, restarted = FuelBurnEstimator(), FuelBurnEstimator()
+    hours = burn(uninterrupted, 80, 5, 1.0, noise=0.5)
+    burn(restarted, 80, 5, 1.0, noise=0.5)
+
+    restored = FuelBurnEstimator()
+    restored.restore(restarted.to_dict())
+    assert restored.burn_rate == pytest.approx(restarted.burn_rate)
+    assert restored.level == pytest.approx(restarted.level)
+
+    burn(uninterrupted, 75, 5, 0.5, start_hours=hours, seed=1)
+    burn(restored, 75, 5, 0.5, start_hours=hours, seed=1)
+    assert restored.burn_rate == pytest.approx(uninterrupted.burn_rate)
+
+
+def test_restore_bad_data_resets():
+    estimator = FuelBurnEstimator()
+    estimator.restore({"sums": [1, 2]})
+    assert estimator.burn_rate is None and estimator.level is None
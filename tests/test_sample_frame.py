@@ -0,0 +1,63 @@
+import pytest
+
+from dse_engine_controller.sample_frame import SampleFrame, FrameTracker
+
+from .app_harness import make_app, set_source, stop
+
+
+def frame(sequence, at):
+    return SampleFrame(sequence=sequence, timestamp=None, received_at=at, rpm=0)
+
+
+def test_missing_values_are_not_a_running_engine():
+    assert not SampleFrame(sequence=0, timestamp=None, received_at=0).engine_running
+    assert SampleFrame(sequence=0, timestamp=None, received_at=0, rpm=1500).engine_running
+
+
+def test_source_sequence_deduplicates():
+    tracker = FrameTracker(stale_after_seconds=10)
+    assert tracker.next_sequence(7, (0,)) == 7
+    assert tracker.accept(frame(7, 100))
+    assert not tracker.accept(frame(7, 101))
+    assert tracker.accept(frame(8, 102))
+
+
+def test_sequenced_source_goes_stale():
+    tracker = FrameTracker(stale_after_seconds=10)
+    tracker.accept(frame(tracker.next_sequence(1, (0,)), 100))
+
+    assert not tracker.is_stale(now=110)
+    assert tracker.is_stale(now=110.5)
+
+
+def test_steady_unsequenced_source_is_not_stale():
+    tracker = FrameTracker(stale_after_seconds=10)
+    first = tracker.next_sequence(None, (0, 40))
+    tracker.accept(frame(first, 100))
+
+    # A stopped engine reading the same values is deduplicated, not flagged stale
+    assert tracker.next_sequence(None, (0, 40)) == first
+    assert not tracker.is_stale(now=1000)
+    assert tracker.next_sequence(None, (0, 41)) == first + 1
+
+
+@pytest.mark.asyncio
+async def test_stale_data_warns_without_faulting(tmp_path):
+    app = make_app(tmp_path / "state.json")
+    await app.setup()
+    set_source(app, sample_seq=1, rpm=0, battery_voltage=13)
+    await app.main_loop()
+
+    # Source stops advancing for longer than the stale window
+    app.frame_tracker.last_advanced_at -= app.frame_tracker.stale_after_seconds + 1
+    await app.main_loop()
+    assert app.stale_data
+    assert app.active_faults == []
+    assert app.state.state == "stopped"
+    assert not app.ui.stale_data_warning.hidden
+
+    set_source(app, sample_seq=2)
+    await app.main_loop()
+    assert not app.stale_data
+    assert app.ui.stale_data_warning.hidden
+    await stop(app)
@@ -0,0 +1,91 @@
+from dse_engine_controller.start_stats import DurationHistogram, StartStatistics
+
+
+def test_histogram_buckets():
+    histogram = DurationHistogram()
+    for seconds in (0.2, 0.5, 0.6, 4, 200):
+        histogram.record(seconds)
+
+    buckets = histogram.to_dict()["buckets"]
+    # Bounds are inclusive upper bounds
+    assert buckets["le_0.5"] == 2
+    assert buckets["le_1"] == 1
+    assert buckets["le_5"] == 1
+    assert buckets["overflow"] == 1
+    assert sum(buckets.values()) == histogram.count == 5
+    assert histogram.min == 0.2 and histogram.max == 200
+    assert histogram.mean == (0.2 + 0.5 + 0.6 + 4 + 200) / 5
+
+
+def run_start(stats, outcome, at=0.0, attempts=1):
+    """Drive a start sequence from stopped to `outcome`, returning the time it ended."""
+    stats.record_transition("stopped", "pre_crank", at - 10, at)
+    state, at = "pre_crank", at + 3
+    for _ in range(attempts):
+        stats.record_transition(state, "cranking", at - 3, at)
+        state = "cranking"
+        if outcome == "running":
+            break
+        stats.record_transition("cranking", "crank_rest", at, at + 10)
+        state, at = "crank_rest", at + 15
+    stats.record_transition(state, outcome, at - 2, at + 2)
+    return at + 2
+
+
+def test_outcome_accounting():
+    stats = StartStatistics()
+    at = run_start(stats, "running")
+    at = run_start(stats, "running", at + 100)
+    at = run_start(stats, "fault", at + 100, attempts=3)
+    # Emergency stop mid-crank is an abort, not a failure
+    run_start(stats, "stopped", at + 100)
+
+    assert (stats.successes, stats.failures, stats.aborts) == (2, 1, 1)
+    assert stats.success_rate == 2 / 3
+
+    summary = stats.to_dict()
+    assert [s["outcome"] for s in summary["recent_starts"]] == ["success", "success", "failed", "aborted"]
+    assert summary["recent_starts"][2]["attempts"] == 3
+    assert summary["recent_starts"][0]["time_to_running"] == 5
+    assert summary["transitions"]["stopped->pre_crank"]["count"] == 4
+
+
+def test_success_rate_ignores_aborts():
+    stats = StartStatistics()
+    assert stats.success_rate is None
+    run_start(stats, "stopped")
+    assert stats.success_rate is None
+    run_start(stats, "running", 100)
+    assert stats.success_rate == 1.0
+
+
+def test_transitions_outside_a_start_are_not_starts():
+    stats = StartStatistics()
+    stats.record_transition("running", "cooling_down", 0, 100)
+    stats.record_transition("cooling_down", "stopped", 100, 160)
+
+    assert not stats.recent_starts
+    assert stats.histograms["cooling_down->stopped"].total == 60
+
+
+def test_rpm_ramp_rate_from_samples_bracketing_threshold():
+    stats = StartStatistics()
+    stats.record_transition("stopped", "pre_crank", 0, 0)
+    stats.record_transition("pre_crank", "cranking", 0, 3)
+
+    # 50 Hz samples: cranking speed, then the engine fires and ramps at 2000 RPM/s
+    at = 3.0
+    for rpm in (0, 40, 80, 80, 80, 120, 160, 1500):
+        stats.record_rpm(rpm, at)
+        at += 0.02
+    # Detected long after it fired (slow loop); the ramp must not depend on that
+    stats.record_transition("cranking", "running", 3, 4.5)
+
+    assert stats.recent_starts[-1]["rpm_ramp_rate"] == 2000
+
+
+def test_rpm_ramp_rate_unknown_without_a_sample_below_threshold():
+    stats = StartStatistics()
+    stats.record_rpm(1500, 1)  # no start in progress, ignored
+    run_start(stats, "running")
+    assert stats.recent_starts[-1]["rpm_ramp_rate"] is None
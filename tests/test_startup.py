@@ -0,0 +1,213 @@
+"""
+Startup and restart tests.
+
+After a watchdog restart the controller must be back in control quickly and
+in the right state: these run pydoover's startup through the first
+`main_loop()` against the startup budget, and check the state checkpoint is
+resumed against live RPM rather than the not-yet-synced tags seen during setup.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from dse_engine_controller.application import STARTUP_BUDGET_SECONDS
+from dse_engine_controller.checkpoint import StateCheckpoint
+
+from .app_harness import APP_KEY, make_app, set_source, stop
+
+# Budget for one checkpoint save + load round trip
+CHECKPOINT_BUDGET_SECONDS = 0.05
+
+STARTUP_SCRIPT = """
+# Imported first, as by the console script, so STARTED_AT is taken before pydoover is imported
+import dse_engine_controller
+
+import asyncio, sys
+sys.path.insert(0, {tests_dir!r})
+from pydoover.docker import run_app
+from app_harness import APP_KEY, SIMULATOR_KEY, FakeDeviceAgent
+from dse_engine_controller.app_config import DseEngineControllerConfig
+from dse_engine_controller.application import DseEngineControllerApplication
+
+async def main():
+    config = DseEngineControllerConfig()
+    agent = FakeDeviceAgent({{
+        "deployment_config": {{"applications": {{APP_KEY: {{
+            config.simulator_app_key._name: SIMULATOR_KEY,
+            config.checkpoint_path._name: {checkpoint_path!r},
+        }}}}}},
+        "tag_values": {{SIMULATOR_KEY: {{"sample_seq": 1, "rpm": 1500, "oil_pressure": 45, "battery_voltage": 13.5}}}},
+        "ui_state": {{}},
+        "ui_cmds": {{}},
+    }})
+    app = DseEngineControllerApplication(config=config, app_key=APP_KEY, device_agent=agent, test_mode=True)
+    runner = asyncio.create_task(run_app(app, start=False))
+    await app.wait_until_ready()
+    await app.next()
+    print(app.state.state, app.startup_seconds, flush=True)
+    runner.cancel()
+
+asyncio.run(main())
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_restart_to_first_main_loop_within_budget(tmp_path):
+    checkpoint_path = tmp_path / "state.json"
+    StateCheckpoint(checkpoint_path).save({"state": "running", "engine_mode": "manual"})
+
+    # pydoover's real startup (deployment config sync, setup, UI comms sync) in a fresh
+    # interpreter, so imports count towards the budget as they would after a restart
+    code = STARTUP_SCRIPT.format(tests_dir=str(Path(__file__).parent), checkpoint_path=str(checkpoint_path))
+    env = {**os.environ, "APP_KEY": APP_KEY, "HEALTHCHECK_PORT": str(free_port())}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, timeout=60)
+    state, elapsed = result.stdout.strip().splitlines()[-1].split()
+
+    assert state == "running"
+    assert float(elapsed) < STARTUP_BUDGET_SECONDS, f"first main loop after {float(elapsed):.2f}s"
+
+
+def test_package_import_is_lazy():
+    # Lightweight submodules (e.g. those loaded by the analysis worker) must not pull in pydoover
+    code = (
+        "import sys, dse_engine_controller.checkpoint; "
+        "print('pydoover' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.asyncio
+async def test_restore_waits_for_rpm(tmp_path):
+    checkpoint_path = tmp_path / "state.json"
+    StateCheckpoint(checkpoint_path).save({"state": "running", "engine_mode": "manual"})
+    saved = checkpoint_path.read_text()
+
+    app = make_app(checkpoint_path)
+    await app.setup()
+    # Tags have not synced yet: RPM is unknown, not zero
+    await app.main_loop()
+    assert app.pending_checkpoint is not None
+    assert checkpoint_path.read_text() == saved
+
+    set_source(app, sample_seq=1, rpm=1500)
+    await app.main_loop()
+    assert app.pending_checkpoint is None
+    assert app.state.state == "running"
+    assert json.loads(checkpoint_path.read_text())["state"] == "running"
+    await stop(app)
+
+
+@pytest.mark.asyncio
+async def test_restore_gives_up_waiting_for_rpm(tmp_path):
+    checkpoint_path = tmp_path / "state.json"
+    StateCheckpoint(checkpoint_path).save({"state": "running", "engine_mode": "auto"})
+
+    app = make_app(checkpoint_path, auto_start_enabled=True)
+    await app.setup()
+    # The data source is down: no RPM ever arrives
+    await app.main_loop()
+    assert app.pending_checkpoint is not None
+    assert not app.auto_start.enabled
+
+    app.pending_checkpoint_since -= app.config.stale_data_seconds.value
+    await app.main_loop()
+    assert app.pending_checkpoint is None
+    assert app.state.state == "stopped"
+    assert app.auto_start.enabled
+    assert "No engine data since restart: engine state unknown, assuming stopped" in app.alerts._messages
+    assert json.loads(checkpoint_path.read_text())["state"] == "stopped"
+    await stop(app)
+
+
+@pytest.mark.asyncio
+async def test_restore_not_plausible_falls_back_to_stopped(tmp_path):
+    checkpoint_path = tmp_path / "state.json"
+    StateCheckpoint(checkpoint_path).save({"state": "cranking", "engine_mode": "manual", "crank_attempts": 2})
+
+    app = make_app(checkpoint_path)
+    set_source(app, sample_seq=1, rpm=0)
+    await app.setup()
+    await app.main_loop()
+
+    assert app.state.state == "stopped"
+    assert app.state.crank_attempts == 0
+    await stop(app)
+
+
+@pytest.mark.asyncio
+async def test_restore_fault_stays_latched(tmp_path):
+    checkpoint_path = tmp_path / "state.json"
+    StateCheckpoint(checkpoint_path).save({
+        "state": "fault",
+        "engine_mode": "auto",
+        "crank_attempts": 3,
+        "active_faults": ["low_oil_pressure"],
+    })
+
+    app = make_app(checkpoint_path)
+    await app.setup()
+
+    # Restored during setup, without waiting for RPM
+    assert app.pending_checkpoint is None
+    assert app.state.state == "fault"
+    assert app.active_faults == ["low_oil_pressure"]
+    assert app.engine_mode == "auto"
+    await stop(app)
+
+
+@pytest.mark.asyncio
+async def test_restore_last_exercise(tmp_path):
+    checkpoint_path = tmp_path / "state.json"
+    last = datetime.now().astimezone() - timedelta(days=2)
+    StateCheckpoint(checkpoint_path).save({
+        "state": "fault",
+        "engine_mode": "auto",
+        "auto_start": {"last_exercise_at": last.isoformat()},
+    })
+
+    app = make_app(checkpoint_path, exercise_interval_days=7)
+    await app.setup()
+
+    # The next run counts from the saved one rather than being the next start hour
+    assert app.auto_start.last_exercise_at == last
+    assert app.auto_start.next_exercise_at().date() == (last + timedelta(days=7)).date()
+    app.save_checkpoint()
+    assert json.loads(checkpoint_path.read_text())["auto_start"] == {"last_exercise_at": last.isoformat()}
+    await stop(app)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    data = {
+        "state": "fault",
+        "crank_attempts": 3,
+        "active_faults": ["low_oil_pressure"],
+        "engine_mode": "auto",
+    }
+
+    start = time.monotonic()
+    StateCheckpoint(tmp_path / "state.json").save(data)
+    loaded = StateCheckpoint(tmp_path / "state.json").load()
+    elapsed = time.monotonic() - start
+
+    assert loaded == data
+    assert elapsed < CHECKPOINT_BUDGET_SECONDS, f"checkpoint round trip took {elapsed * 1000:.1f}ms"
+
+
+def test_checkpoint_missing_or_corrupt(tmp_path):
+    assert StateCheckpoint(tmp_path / "missing.json").load() is None
+
+    (tmp_path / "corrupt.json").write_text("{not json")
+    assert StateCheckpoint(tmp_path / "corrupt.json").load() is None
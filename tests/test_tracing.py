@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from dse_engine_controller.sample_frame import SampleFrame
+from dse_engine_controller.tracing import NULL_TRACE, LatencyTracer, Trace, _percentile
+
+from .app_harness import make_app, set_source, stop
+
+
+def test_percentile_nearest_rank():
+    ordered = list(range(1, 101))
+    assert _percentile(ordered, 50) == 50
+    assert _percentile(ordered, 90) == 90
+    assert _percentile(ordered, 99) == 99
+    assert _percentile(ordered, 100) == 100
+    assert _percentile([7.0], 99) == 7.0
+    assert _percentile([1, 2, 3, 4], 0) == 1
+
+
+def test_disabled_tracer_returns_null_trace():
+    tracer = LatencyTracer(enabled=False)
+    trace = tracer.begin(SampleFrame(sequence=1, timestamp=None, received_at=1.0))
+    assert trace is NULL_TRACE
+    trace.mark("alarms")
+    tracer.finish(trace)
+    assert tracer.summary() == {}
+    assert not tracer.export_due()
+
+
+def test_hops_and_end_to_end(tmp_path):
+    tracer = LatencyTracer(enabled=True, report_path=tmp_path / "latency.json")
+    for i in range(10):
+        frame = SampleFrame(sequence=i, timestamp=None, received_at=100.0, source_monotonic=99.99)
+        trace = tracer.begin(frame)
+        trace.mark("alarms", 100.001)
+        # A skipped stage is measured across, not as zero
+        trace.mark("published", 100.005 + i * 0.001)
+        tracer.finish(trace)
+
+    summary = tracer.summary()
+    assert set(summary) == {"source->acquired", "acquired->alarms", "alarms->published", "end_to_end"}
+    assert summary["source->acquired"]["p50"] == pytest.approx(10)
+    assert summary["alarms->published"]["p50"] == pytest.approx(8)
+    assert summary["alarms->published"]["max"] == pytest.approx(13)
+    assert summary["end_to_end"]["count"] == 10
+    assert summary["end_to_end"]["p99"] == pytest.approx(24)
+
+    assert tracer.export() == summary
+    assert json.loads((tmp_path / "latency.json").read_text()) == summary
+
+
+def test_window_keeps_recent_samples():
+    tracer = LatencyTracer(enabled=True, window=5)
+    for i in range(20):
+        trace = Trace(None)
+        trace.mark("acquired", 0)
+        trace.mark("alarms", i)
+        tracer.finish(trace)
+    assert tracer.summary()["acquired->alarms"]["count"] == 5
+    assert tracer.summary()["acquired->alarms"]["p50"] == 17000
+
+
+@pytest.mark.asyncio
+async def test_ui_hop_ends_when_ui_is_sent(tmp_path):
+    app = make_app(tmp_path / "state.json", latency_tracing=True)
+    await app.setup()
+    set_source(app, sample_seq=1, rpm=0, sample_mono=0.0)
+    await app.main_loop()
+
+    # Staged in memory only; the frame's trace is not finished until pydoover sends the UI
+    assert app.tracer.hops == {}
+
+    await app._update_ui()
+    hops = app.tracer.hops
+    assert "state->ui_staged" in hops and "ui_staged->published" in hops and "published->ui_sent" in hops
+    assert len(hops["end_to_end"]) == 1
+    await stop(app)